@@ -0,0 +1,85 @@
+"""Compare Chrome launch profiles: driver startup, page-ready time and memory (RSS).
+
+Run from the project folder: ``python -m benchmarks.bench_chrome_launch [--url URL]``.
+Needs Chrome and chromedriver. RSS is read with psutil when it is installed and
+from /proc otherwise; it is reported as n/a when neither is available.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from core.playtomic_bot import PlaytomicBot
+
+try:
+    import psutil
+except ImportError:  # optional
+    psutil = None
+
+
+def _linux_process_tree(root_pid: int) -> list[int]:
+    children: dict[int, list[int]] = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def tree_rss_mb(root_pid: int) -> float | None:
+    if psutil is not None:
+        root = psutil.Process(root_pid)
+        processes = [root, *root.children(recursive=True)]
+        return sum(p.memory_info().rss for p in processes) / 1_048_576
+    if not Path("/proc").exists():
+        return None
+    total_kb = 0
+    for pid in _linux_process_tree(root_pid):
+        try:
+            for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def measure(profile: str, url: str) -> tuple[float, float, float | None]:
+    bot = PlaytomicBot(logger=logging.getLogger("bench"), launch_profile=profile)
+    started = time.perf_counter()
+    driver = bot._build_driver("bench@example.com")
+    try:
+        launched = time.perf_counter()
+        driver.get(url)
+        ready = time.perf_counter()
+        rss = tree_rss_mb(driver.service.process.pid)
+        return launched - started, ready - launched, rss
+    finally:
+        driver.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="https://playtomic.io/")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'launch s':>9} {'page ready s':>13} {'RSS MB':>8}")
+    for profile in PlaytomicBot.LAUNCH_PROFILES:
+        for _ in range(args.runs):
+            launch, ready, rss = measure(profile, args.url)
+            rss_text = f"{rss:>8.0f}" if rss is not None else f"{'n/a':>8}"
+            print(f"{profile:<12} {launch:>9.2f} {ready:>13.2f} {rss_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Micro-benchmark: connection-per-operation versus persistent WAL connections.
+
+Run from the project folder: ``python -m benchmarks.bench_db``.
+"""
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from database.db import Database
+
+
+def _legacy_execute(db_path: Path, query: str, params: tuple) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(query, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _legacy_fetchone(db_path: Path, query: str, params: tuple) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(query, params).fetchone()
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _run(label: str, operations: int, write, read) -> None:
+    started = time.perf_counter()
+    for i in range(operations):
+        write(i)
+        read(i)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<12} {operations * 2 / elapsed:>10.0f} ops/s ({elapsed:.2f} s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=2000)
+    args = parser.parse_args()
+
+    upsert = "INSERT INTO app_settings (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+    select = "SELECT value FROM app_settings WHERE key = ?"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy.db"
+        Database(legacy_path).close()
+        with sqlite3.connect(legacy_path) as conn:
+            conn.execute("PRAGMA journal_mode = DELETE")
+        _run(
+            "legacy",
+            args.operations,
+            lambda i: _legacy_execute(legacy_path, upsert, (f"k{i % 50}", str(i))),
+            lambda i: _legacy_fetchone(legacy_path, select, (f"k{i % 50}",)),
+        )
+
+        db = Database(Path(tmp) / "pooled.db")
+        try:
+            _run(
+                "persistent",
+                args.operations,
+                lambda i: db.execute(upsert, (f"k{i % 50}", str(i))),
+                lambda i: db.fetchone(select, (f"k{i % 50}",)),
+            )
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
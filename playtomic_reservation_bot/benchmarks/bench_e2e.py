@@ -0,0 +1,138 @@
+"""End-to-end booking latency against the local fake Playtomic site.
+
+Runs the real pipeline (Database, ReservationService, ReservationScheduler,
+TimeController and a booking backend) for reservations due a few seconds from now
+and reports time-to-confirm percentiles relative to ``execution_datetime_local``:
+
+* ``confirm``: the fake site accepted the booking.
+* ``status``: the final status write was committed to SQLite.
+
+It then prints the per-phase p50/p95 recorded in ``reservation_timings``.
+
+Run from the project folder, e.g.
+``python -m benchmarks.bench_e2e --backend http --reservations 20 --latency-ms 50``.
+The selenium backend needs Chrome and chromedriver.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks.fake_playtomic import FakePlaytomicServer
+from core.booking_backend import BookingBackend
+from core.http_backend import HttpBookingBackend
+from core.playtomic_bot import PlaytomicBot
+from core.reservation_service import ReservationChange, ReservationService
+from core.scheduler import ReservationScheduler
+from core.timing import percentile
+from database.db import Database
+
+LOCAL_TZ = "Europe/Madrid"
+
+
+def build_backend(name: str, logger: logging.Logger, server: FakePlaytomicServer) -> BookingBackend:
+    if name == "http":
+        return HttpBookingBackend(logger=logger, api_base_url=server.url)
+    return PlaytomicBot(logger=logger, launch_profile="performance", login_url=f"{server.url}/users/login")
+
+
+def report(label: str, values_ms: list[float]) -> None:
+    if not values_ms:
+        print(f"{label:<8} no samples")
+        return
+    print(
+        f"{label:<8} p50={percentile(values_ms, 50):8.1f} ms  p95={percentile(values_ms, 95):8.1f} ms  "
+        f"p99={percentile(values_ms, 99):8.1f} ms  max={max(values_ms):8.1f} ms  n={len(values_ms)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=("http", "selenium"), default="http")
+    parser.add_argument("--reservations", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--taken-ratio", type=float, default=0)
+    parser.add_argument("--start-in", type=float, default=8, help="seconds until the first execution instant")
+    parser.add_argument("--stagger-ms", type=float, default=0, help="spacing between execution instants")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench_e2e")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    server = FakePlaytomicServer(latency_ms=args.latency_ms, taken_ratio=args.taken_ratio).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.db")
+        db.execute("INSERT INTO clubs (name, base_url) VALUES (?, ?)", ("Fake club", server.url))
+        db.execute("INSERT INTO accounts (email, password, active) VALUES (?, ?, 1)", ("bench@example.com", "secret"))
+        court_ids = [
+            db.execute(
+                "INSERT INTO courts (club_id, name, booking_fragment_url) VALUES (1, ?, ?)",
+                (f"Court {i}", f"club/court-{i}"),
+            )
+            for i in range(args.reservations)
+        ]
+
+        service = ReservationService(
+            db=db,
+            logger=logger,
+            local_tz=LOCAL_TZ,
+            target_tz="UTC",
+            prewarm_seconds=min(5, args.start_in / 2),
+            bot=build_backend(args.backend, logger, server),
+        )
+        scheduler = ReservationScheduler(service=service, max_workers=args.workers, lead_seconds=args.start_in)
+
+        finished: dict[int, int] = {}
+        all_done = threading.Event()
+
+        def on_change(change: ReservationChange) -> None:
+            if change.status in ("Success", "Failed", "Cancelled"):
+                finished[change.reservation_id] = time.time_ns()
+                if len(finished) == len(court_ids):
+                    all_done.set()
+
+        service.add_change_listener(on_change)
+
+        first = datetime.now(service._zone) + timedelta(seconds=args.start_in)
+        execution_ns: dict[int, int] = {}
+        court_reservation: dict[str, int] = {}
+        for i, court_id in enumerate(court_ids):
+            execution_dt = first + timedelta(milliseconds=i * args.stagger_ms)
+            res_id = service.create_reservation(court_id, 1, execution_dt + timedelta(days=2))
+            execution_ns[res_id] = int(execution_dt.timestamp() * 1_000_000_000)
+            court_reservation[f"club/court-{i}"] = res_id
+
+        scheduler.start()
+        all_done.wait(timeout=args.start_in + 120)
+        # The last status write fires all_done before that job records its timings.
+        scheduler.stop(wait=True)
+        service.close()
+
+        confirm_ms = [
+            (confirmed_ns - execution_ns[court_reservation[slot_key.split("|")[0]]]) / 1_000_000
+            for slot_key, confirmed_ns in server.confirmations
+        ]
+        status_ms = [(done_ns - execution_ns[res_id]) / 1_000_000 for res_id, done_ns in finished.items()]
+        statuses = [row["status"] for row in service.list_reservations()]
+        phases = service.phase_latency_report()
+        db.close()
+    server.stop()
+
+    print(f"backend={args.backend} reservations={args.reservations} latency={args.latency_ms} ms")
+    report("confirm", confirm_ms)
+    report("status", status_ms)
+    print({status: statuses.count(status) for status in sorted(set(statuses))})
+    print(f"{'phase':<20} {'p50 ms':>9} {'p95 ms':>9} {'n':>4}")
+    for row in phases:
+        print(f"{row['phase']:<20} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['samples']:>4}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Cold-start import budget for the application entry points.
+
+Imports each module in a fresh interpreter with ``-X importtime`` and sums the
+self time of every import. Exits non-zero when the median of ``--runs`` goes over
+``--budget-ms``, when a forbidden module is loaded at startup (Selenium and
+urllib3 for every entry point, Tk as well for ``cli``) or when a module fails to
+import.
+
+Run from the project folder: ``python -m benchmarks.bench_import_time [--budget-ms 250] [module ...]``.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("selenium", "tkcalendar", "urllib3")
+# The headless entry point must run without a display, so it may never pull in Tk.
+FORBIDDEN = {"cli": (*HEAVY_MODULES, "tkinter", "customtkinter"), "main": HEAVY_MODULES}
+
+
+def import_profile(module: str) -> dict[str, tuple[int, int]]:
+    """``{imported package: (self us, cumulative us)}`` for one cold import of ``module``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    profile = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=["cli", "main"])
+    parser.add_argument("--budget-ms", type=float, default=250)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list")
+    parser.add_argument("--forbid", nargs="*", help="modules no entry point may load (default: per entry point)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        try:
+            profiles = [import_profile(module) for _ in range(args.runs)]
+        except RuntimeError as exc:
+            print(f"{module:<12} IMPORT FAILED: {exc}")
+            failed = True
+            continue
+        totals = [sum(self_us for self_us, _ in profile.values()) / 1000 for profile in profiles]
+        median = statistics.median(totals)
+        loaded = profiles[0].keys()
+        forbid = args.forbid if args.forbid is not None else FORBIDDEN.get(module, HEAVY_MODULES)
+        forbidden = sorted(name for name in forbid if name in loaded)
+        over = median > args.budget_ms
+        failed = failed or over or bool(forbidden)
+
+        print(
+            f"{module:<12} median={median:7.1f} ms  min={min(totals):7.1f} ms  "
+            f"budget={args.budget_ms:.0f} ms  {'OVER BUDGET' if over else 'ok'}"
+        )
+        if forbidden:
+            print(f"{'':<12} loaded at startup: {', '.join(forbidden)}")
+        slowest = sorted(profiles[0].items(), key=lambda item: item[1][1], reverse=True)
+        for name, (_, cumulative_us) in [item for item in slowest if item[0] != module][: args.top]:
+            print(f"{'':<12} {cumulative_us / 1000:7.1f} ms  {name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Local stand-in for Playtomic used by the benchmarks.
+
+Serves the login form (``name=email``/``name=password``), booking pages with
+``data-testid='book-button'`` and ``'confirm-booking'``, and the JSON API used by
+HttpBookingBackend. Every response can be delayed by ``latency_ms`` and a fraction
+``taken_ratio`` of confirmations loses the slot to a simulated rival.
+
+Standalone: ``python -m benchmarks.fake_playtomic --port 8765 --latency-ms 80``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+LOGIN_PAGE = """<!doctype html><html><body>
+<form method="post" action="/users/login">
+<input name="email" type="email"><input name="password" type="password">
+<button type="submit">Log in</button>
+</form></body></html>"""
+
+BOOKING_PAGE = """<!doctype html><html><body>
+<form method="post" action="/booking/select?{query}">
+<button type="submit" data-testid="book-button">Book</button>
+</form></body></html>"""
+
+CONFIRM_PAGE = """<!doctype html><html><body>
+<form method="post" action="/booking/confirm?{query}">
+<button type="submit" data-testid="confirm-booking">Confirm</button>
+</form></body></html>"""
+
+RESULT_PAGE = """<!doctype html><html><body><p data-testid="booking-result">{result}</p></body></html>"""
+
+
+class _BurstHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 drops SYNs when many jobs fire at the same instant.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FakePlaytomicServer:
+    """Threaded HTTP server that records every confirmed booking with its wall-clock time."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0, taken_ratio: float = 0) -> None:
+        self.latency_ms = latency_ms
+        self.taken_ratio = taken_ratio
+        self.sessions: set[str] = set()
+        self.tokens: set[str] = set()
+        self.confirmations: list[tuple[str, int]] = []
+        self.booked: set[str] = set()
+        self.lock = threading.Lock()
+        self._server = _BurstHTTPServer((host, port), self._handler_class())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakePlaytomicServer:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-playtomic", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def confirm(self, slot_key: str) -> bool:
+        """Book ``slot_key``; False when it is already ours or a simulated rival wins it."""
+        with self.lock:
+            if slot_key in self.booked or random.random() < self.taken_ratio:
+                return False
+            self.booked.add(slot_key)
+            self.confirmations.append((slot_key, time.time_ns()))
+            return True
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args) -> None:  # noqa: A002
+                pass
+
+            def _delay(self) -> None:
+                if site.latency_ms:
+                    time.sleep(site.latency_ms / 1000)
+
+            def _send(self, status: int, body: str, content_type: str = "text/html", headers: dict | None = None) -> None:
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _json(self, status: int, payload: dict) -> None:
+                self._send(status, json.dumps(payload), "application/json")
+
+            def _redirect(self, location: str, headers: dict | None = None) -> None:
+                self._send(303, "", headers={"Location": location, **(headers or {})})
+
+            def _body(self) -> bytes:
+                return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+            def _session(self) -> str | None:
+                for part in (self.headers.get("Cookie") or "").split(";"):
+                    name, _, value = part.strip().partition("=")
+                    if name == "session" and value in site.sessions:
+                        return value
+                return None
+
+            def _authorized(self) -> bool:
+                token = (self.headers.get("Authorization") or "").removeprefix("Bearer ")
+                return token in site.tokens
+
+            def do_GET(self) -> None:  # noqa: N802
+                self._delay()
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                if url.path == "/users/login":
+                    if self._session():
+                        self._redirect("/")
+                    else:
+                        self._send(200, LOGIN_PAGE)
+                elif url.path == "/v1/availability":
+                    if not self._authorized():
+                        self._json(401, {"message": "unauthorized"})
+                        return
+                    slot_key = _slot_key(query.get("court", [""])[0], query.get("date", [""])[0], query.get("time", [""])[0])
+                    if slot_key in site.booked:
+                        self._json(404, {"code": "slot_not_available", "message": "slot not available"})
+                    else:
+                        self._json(200, {"slot_id": slot_key})
+                elif url.path == "/_stats":
+                    with site.lock:
+                        self._json(200, {"confirmations": site.confirmations})
+                elif url.path == "/":
+                    self._send(200, RESULT_PAGE.format(result="home"))
+                elif not self._session():
+                    self._redirect("/users/login")
+                else:
+                    court = url.path.strip("/")
+                    slot = urlencode({"slot": _slot_key(court, query.get("date", [""])[0], query.get("time", [""])[0])})
+                    self._send(200, BOOKING_PAGE.format(query=slot))
+
+            def do_POST(self) -> None:  # noqa: N802
+                self._delay()
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                body = self._body()
+                if url.path == "/users/login":
+                    session = secrets.token_hex(8)
+                    site.sessions.add(session)
+                    self._redirect("/", {"Set-Cookie": f"session={session}; Path=/"})
+                elif url.path == "/v3/auth/login":
+                    credentials = json.loads(body or b"{}")
+                    if not credentials.get("email") or not credentials.get("password"):
+                        self._json(400, {"message": "missing credentials"})
+                        return
+                    token = secrets.token_hex(8)
+                    site.tokens.add(token)
+                    self._json(200, {"access_token": token})
+                elif url.path == "/v1/bookings":
+                    if not self._authorized():
+                        self._json(401, {"message": "unauthorized"})
+                        return
+                    slot_key = json.loads(body or b"{}").get("slot_id", "")
+                    if site.confirm(slot_key):
+                        self._json(201, {"booking_id": len(site.confirmations)})
+                    else:
+                        self._json(409, {"message": "slot already booked"})
+                elif not self._session():
+                    self._redirect("/users/login")
+                elif url.path == "/booking/select":
+                    self._send(200, CONFIRM_PAGE.format(query=urlencode({"slot": query.get("slot", [""])[0]})))
+                elif url.path == "/booking/confirm":
+                    ok = site.confirm(query.get("slot", [""])[0])
+                    self._send(200 if ok else 409, RESULT_PAGE.format(result="confirmed" if ok else "taken"))
+                else:
+                    self._send(404, RESULT_PAGE.format(result="not found"))
+
+        return Handler
+
+
+def _slot_key(court: str, date: str, time_code: str) -> str:
+    return f"{court.strip('/')}|{date}|{time_code}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--taken-ratio", type=float, default=0)
+    args = parser.parse_args()
+    server = FakePlaytomicServer(port=args.port, latency_ms=args.latency_ms, taken_ratio=args.taken_ratio)
+    print(f"Fake Playtomic listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
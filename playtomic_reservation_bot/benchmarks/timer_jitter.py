@@ -0,0 +1,46 @@
+"""Jitter report for TimeController.wait_until on this machine.
+
+Run from the project folder: ``python -m benchmarks.timer_jitter``.
+Lateness is the wall-clock time between the target instant and the moment
+``wait_until`` returns.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from core.time_controller import TimeController
+from core.timing import percentile
+
+
+def measure(controller: TimeController, samples: int) -> list[float]:
+    lateness_ms = []
+    never_cancelled = threading.Event()
+    for _ in range(samples):
+        target = controller.now() + timedelta(seconds=random.uniform(0.3, 1.5))
+        controller.wait_until(target, cancel_event=never_cancelled)
+        fired_ns = time.time_ns()
+        lateness_ms.append((fired_ns - target.timestamp() * 1_000_000_000) / 1_000_000)
+    return lateness_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=30)
+    parser.add_argument("--tz", default="UTC")
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for label, precise in (("coarse", False), ("precise", True)):
+        lateness = measure(TimeController(args.tz, precise=precise), args.samples)
+        print(
+            f"{label:<8} {percentile(lateness, 50):>8.3f} {percentile(lateness, 99):>8.3f} {max(lateness):>8.3f}"
+        )
+    print(f"measured at {datetime.now().isoformat(timespec='seconds')}, {args.samples} samples per mode")
+
+
+if __name__ == "__main__":
+    main()
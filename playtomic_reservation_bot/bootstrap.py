@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from logging.handlers import QueueListener
+from pathlib import Path
+
+from core.archiver import ReservationArchiver
+from core.booking_backend import BookingBackend, FallbackBackend
+from core.logging_setup import start_queue_logging
+from core.playtomic_bot import PlaytomicBot
+from core.reservation_service import ReservationService
+from core.scheduler import ReservationScheduler
+from database.db import Database
+
+BASE_DIR = Path(__file__).resolve().parent
+# Archiving (and its one-off full VACUUM) holds the writer; keep it this far from any dispatch.
+ARCHIVE_MARGIN_SECONDS = 600
+
+
+def configure_logging(base_dir: Path, db: Database, console: bool = False) -> tuple[logging.Logger, QueueListener | None]:
+    log_dir = base_dir / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    logger = logging.getLogger("playtomic_bot")
+    logger.setLevel(logging.INFO)
+
+    if logger.handlers:
+        return logger, None
+    listener = start_queue_logging(
+        logger,
+        log_dir / "app.log",
+        log_format=get_setting(db, "log_format", "text"),
+        max_bytes=int(get_setting(db, "log_max_bytes", "5000000")),
+        backup_count=int(get_setting(db, "log_backup_count", "5")),
+        console=console,
+    )
+    return logger, listener
+
+
+def get_setting(db: Database, key: str, default: str) -> str:
+    row = db.fetchone("SELECT value FROM app_settings WHERE key = ?", (key,))
+    return row["value"] if row else default
+
+
+def build_backend(db: Database, logger: logging.Logger, base_dir: Path) -> BookingBackend:
+    bot: BookingBackend = PlaytomicBot(
+        logger=logger,
+        session_max_uses=int(get_setting(db, "session_max_uses", "20")),
+        session_max_age_seconds=float(get_setting(db, "session_max_age_seconds", "1800")),
+        profile_dir=base_dir / "profiles" if get_setting(db, "chrome_profiles", "0") == "1" else None,
+        launch_profile=get_setting(db, "chrome_launch_profile", "standard"),
+    )
+    if get_setting(db, "booking_backend", "selenium") == "http":
+        # The HTTP contract is only verified against benchmarks/fake_playtomic.py, so it needs an explicit URL.
+        api_base_url = get_setting(db, "http_api_base_url", "")
+        if not api_base_url:
+            logger.warning("booking_backend = http ignored: http_api_base_url is not set, using Selenium only")
+            return bot
+        from core.http_backend import HttpBookingBackend
+
+        http_backend = HttpBookingBackend(logger=logger, api_base_url=api_base_url)
+        bot = FallbackBackend(primary=http_backend, fallback=bot, logger=logger)
+    return bot
+
+
+@dataclass(slots=True)
+class AppContext:
+    """Everything the GUI and the headless daemon share; never imports Tk."""
+
+    db: Database
+    logger: logging.Logger
+    service: ReservationService
+    scheduler: ReservationScheduler
+    archiver: ReservationArchiver
+    log_listener: QueueListener | None = None
+
+    def start_archiving(self) -> None:
+        """Archive periodically unless ``archive_retention_days`` is 0; waits while bookings run."""
+        if self.archiver.retention_days <= 0:
+            return
+        interval = float(get_setting(self.db, "archive_interval_hours", "24")) * 3600
+        self.archiver.start(interval, is_busy=self._archive_blocked)
+
+    def _archive_blocked(self) -> bool:
+        """Bookings running, or the next one dispatched before a long archive pass could finish."""
+        if self.scheduler.pool_stats().active > 0:
+            return True
+        due_ms = self.service.next_pending_epoch_ms()
+        if due_ms is None:
+            return False
+        quiet_ms = self.scheduler.lead_ms + ARCHIVE_MARGIN_SECONDS * 1000
+        return due_ms - time.time_ns() // 1_000_000 < quiet_ms
+
+    def close(self) -> None:
+        # Interrupted jobs write their status back (e.g. to Pending) before the database closes.
+        self.scheduler.stop(wait=True)
+        self.archiver.stop()
+        self.service.close()
+        self.db.close()
+        if self.log_listener is not None:
+            self.log_listener.stop()  # flushes queued records
+
+
+def create_app(base_dir: Path = BASE_DIR, db_path: Path | None = None, console_log: bool = False) -> AppContext:
+    db = Database(db_path or base_dir / "database" / "playtomic.db")
+    logger, log_listener = configure_logging(base_dir, db, console=console_log)
+    service = ReservationService(
+        db=db,
+        logger=logger,
+        local_tz=get_setting(db, "local_tz", "Europe/Madrid"),
+        target_tz=get_setting(db, "target_tz", "UTC"),
+        prewarm_seconds=float(get_setting(db, "prewarm_seconds", "30")),
+        bot=build_backend(db, logger, base_dir),
+    )
+    scheduler = ReservationScheduler(
+        service=service,
+        max_workers=int(get_setting(db, "scheduler_workers", "8")),
+        lead_seconds=float(get_setting(db, "scheduler_lead_seconds", "60")),
+    )
+    archiver = ReservationArchiver(
+        db=db,
+        logger=logger,
+        retention_days=float(get_setting(db, "archive_retention_days", "90")),
+    )
+    return AppContext(
+        db=db,
+        logger=logger,
+        service=service,
+        scheduler=scheduler,
+        archiver=archiver,
+        log_listener=log_listener,
+    )
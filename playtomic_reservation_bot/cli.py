@@ -0,0 +1,167 @@
+"""Headless entry point: run the scheduler as a daemon and manage reservations.
+
+Usage (from the repository root)::
+
+    python -m playtomic_reservation_bot run
+    python -m playtomic_reservation_bot add COURT_ID ACCOUNT_ID "2026-10-20 18:30" [--priority N] [--all-courts]
+    python -m playtomic_reservation_bot list [--status Pending ...] [--club ID] [--from 2026-10-01 --to 2026-10-08] [--archived]
+    python -m playtomic_reservation_bot cancel RESERVATION_ID | --group GROUP_ID
+    python -m playtomic_reservation_bot archive [--retention-days 90]
+
+Nothing here imports Tk, so it runs on machines without a display.
+"""
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import threading
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+from bootstrap import AppContext, create_app
+from core.reservation_service import ReservationQuery
+
+
+def run_daemon(context: AppContext, poll_seconds: float) -> int:
+    stop = threading.Event()
+
+    def request_stop(signum: int, _frame) -> None:
+        context.logger.info("Signal %s received, shutting down", signum)
+        stop.set()
+
+    for name in ("SIGINT", "SIGTERM", "SIGBREAK"):
+        sig = getattr(signal, name, None)
+        if sig is not None:
+            signal.signal(sig, request_stop)
+
+    context.scheduler.start()
+    context.start_archiving()
+    version = context.db.data_version()
+    context.logger.info("Headless scheduler running (external changes checked every %ss)", poll_seconds)
+    # Reservations added or cancelled from another process (GUI or CLI) only show up as a new data_version.
+    while not stop.wait(poll_seconds):
+        current = context.db.data_version()
+        if current != version:
+            version = current
+            context.scheduler.reload()
+    context.scheduler.stop(wait=True)
+    context.logger.info("Headless scheduler stopped")
+    return 0
+
+
+def add_reservation(context: AppContext, args: argparse.Namespace) -> int:
+    if args.all_courts:
+        club = context.db.fetchone("SELECT club_id FROM courts WHERE id = ?", (args.court_id,))
+        if club is None:
+            print(f"Cancha {args.court_id} no encontrada", file=sys.stderr)
+            return 1
+        court_ids = [args.court_id] + [
+            r["id"] for r in context.db.fetchall("SELECT id FROM courts WHERE club_id = ?", (club["club_id"],))
+        ]
+        group_id = context.service.create_slot_group(court_ids, [args.account_id], args.play_datetime, args.priority)
+        print(f"Grupo de reserva {group_id} creado")
+    else:
+        reservation_id = context.service.create_reservation(
+            args.court_id, args.account_id, args.play_datetime, args.priority
+        )
+        print(f"Reserva {reservation_id} creada")
+    return 0
+
+
+def list_reservations(context: AppContext, args: argparse.Namespace) -> int:
+    service = context.service
+    query = ReservationQuery(
+        statuses=tuple(args.status or ()),
+        from_epoch_ms=service.epoch_ms(args.date_from) if args.date_from else None,
+        to_epoch_ms=service.epoch_ms(args.date_to) if args.date_to else None,
+        club_id=args.club,
+        account_id=args.account,
+        archived=args.archived,
+    )
+    rows = service.iter_reservations(query)
+    if args.limit:
+        rows = islice(rows, args.limit)
+    print(f"{'ID':>5}  {'Cancha':<20} {'Cuenta':<28} {'Juego':<26} {'Ejecución':<26} {'Estado':<10} Grupo")
+    for row in rows:
+        # Archived rows may outlive their court or account, which then come back as None.
+        print(
+            f"{row['id']:>5}  {row['court_name'] or '':<20} {row['email'] or '':<28} {row['play_datetime_local']:<26} "
+            f"{row['execution_datetime_local']:<26} {row['status']:<10} {row['group_id'] or ''}"
+        )
+    return 0
+
+
+def archive(context: AppContext, args: argparse.Namespace) -> int:
+    if args.retention_days is not None:
+        context.archiver.retention_days = args.retention_days
+    moved = context.archiver.run()
+    print(f"{moved} reservas archivadas")
+    return 0
+
+
+def cancel(context: AppContext, args: argparse.Namespace) -> int:
+    if args.group is not None:
+        context.service.cancel_group(args.group)
+        print(f"Grupo {args.group} cancelado")
+    else:
+        context.service.cancel_reservation(args.reservation_id)
+        print(f"Reserva {args.reservation_id} cancelada")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="playtomic_reservation_bot", description="Bot de reservas Playtomic sin interfaz")
+    parser.add_argument("--db", type=Path, help="ruta de la base de datos SQLite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="ejecuta el planificador hasta recibir SIGINT/SIGTERM")
+    run.add_argument("--poll-seconds", type=float, default=2, help="cada cuánto se detectan cambios externos")
+
+    add = commands.add_parser("add", help="crea una reserva")
+    add.add_argument("court_id", type=int)
+    add.add_argument("account_id", type=int)
+    add.add_argument("play_datetime", type=datetime.fromisoformat, help="fecha y hora local, p. ej. '2026-10-20 18:30'")
+    add.add_argument("--priority", type=int, default=0, help="orden de disparo entre reservas simultáneas")
+    add.add_argument("--all-courts", action="store_true", help="cubrir todas las canchas del club")
+
+    listing = commands.add_parser("list", help="lista las reservas")
+    listing.add_argument("--status", nargs="+", help="filtra por estado")
+    listing.add_argument("--club", type=int, help="id del club")
+    listing.add_argument("--account", type=int, help="id de la cuenta")
+    listing.add_argument("--from", dest="date_from", type=datetime.fromisoformat, help="ejecución desde (fecha local)")
+    listing.add_argument("--to", dest="date_to", type=datetime.fromisoformat, help="ejecución hasta, sin incluir")
+    listing.add_argument("--limit", type=int, help="máximo de filas")
+    listing.add_argument("--archived", action="store_true", help="consulta el histórico archivado")
+
+    cancel_cmd = commands.add_parser("cancel", help="cancela una reserva o un grupo")
+    target = cancel_cmd.add_mutually_exclusive_group(required=True)
+    target.add_argument("reservation_id", type=int, nargs="?")
+    target.add_argument("--group", type=int)
+
+    archive_cmd = commands.add_parser("archive", help="archiva ahora las reservas terminadas antiguas")
+    archive_cmd.add_argument("--retention-days", type=float, help="antigüedad mínima (por defecto archive_retention_days)")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    context = create_app(db_path=args.db, console_log=args.command == "run")
+    try:
+        if args.command == "run":
+            return run_daemon(context, args.poll_seconds)
+        handler = {"add": add_reservation, "list": list_reservations, "cancel": cancel, "archive": archive}[
+            args.command
+        ]
+        try:
+            return handler(context, args)
+        except ValueError as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            return 1
+    finally:
+        context.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
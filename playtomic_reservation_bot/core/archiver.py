@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from database.db import Database
+
+RESERVATION_COLUMNS = (
+    "id, court_id, account_id, play_datetime_local, execution_datetime_local, status, created_at, "
+    "group_id, priority, play_epoch_ms, execution_epoch_ms"
+)
+TIMING_COLUMNS = "id, reservation_id, attempt, phase, duration_ms, recorded_at"
+
+
+class ReservationArchiver:
+    """Moves finished reservations older than the retention window into ``reservations_archive``.
+
+    Rows move in batches, one short write transaction each, so booking threads
+    waiting on the writer lock are only delayed by a single batch. Freed pages are
+    handed back with an incremental vacuum afterwards.
+    """
+
+    FINISHED_STATUSES = ("Success", "Failed", "Cancelled")
+    FIRST_RUN_DELAY_SECONDS = 60
+    BUSY_RETRY_SECONDS = 300
+
+    def __init__(self, db: Database, logger: logging.Logger, retention_days: float = 90, batch_size: int = 500) -> None:
+        self.db = db
+        self.logger = logger
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run(self, now_ms: int | None = None) -> int:
+        """Archive one full pass; returns how many reservations were moved."""
+        if now_ms is None:
+            now_ms = time.time_ns() // 1_000_000
+        cutoff = now_ms - round(self.retention_days * 86_400_000)
+        if self.db.enable_incremental_vacuum():
+            self.logger.info("Database switched to incremental auto-vacuum")
+
+        moved = 0
+        while not self._stop_event.is_set():
+            batch = self._archive_batch(cutoff)
+            if not batch:
+                break
+            moved += batch
+        if moved:
+            self.db.incremental_vacuum()
+            self.logger.info("Archived %s finished reservations older than %s days", moved, self.retention_days)
+        return moved
+
+    def _archive_batch(self, cutoff_ms: int) -> int:
+        with self.db.transaction() as conn:
+            ids = [
+                row["id"]
+                for row in conn.execute(
+                    """
+                    SELECT id FROM reservations
+                    WHERE status IN (?, ?, ?) AND execution_epoch_ms < ?
+                    ORDER BY execution_epoch_ms
+                    LIMIT ?
+                    """,
+                    (*self.FINISHED_STATUSES, cutoff_ms, self.batch_size),
+                )
+            ]
+            if not ids:
+                return 0
+            placeholders = ", ".join("?" for _ in ids)
+            conn.execute(
+                f"INSERT INTO reservations_archive ({RESERVATION_COLUMNS}) "
+                f"SELECT {RESERVATION_COLUMNS} FROM reservations WHERE id IN ({placeholders})",
+                ids,
+            )
+            conn.execute(
+                f"INSERT INTO reservation_timings_archive ({TIMING_COLUMNS}) "
+                f"SELECT {TIMING_COLUMNS} FROM reservation_timings WHERE reservation_id IN ({placeholders})",
+                ids,
+            )
+            conn.execute(f"DELETE FROM reservation_timings WHERE reservation_id IN ({placeholders})", ids)
+            conn.execute(f"DELETE FROM reservations WHERE id IN ({placeholders})", ids)
+        return len(ids)
+
+    def start(self, interval_seconds: float, is_busy: Callable[[], bool] = lambda: False) -> None:
+        """Archive every ``interval_seconds`` on a daemon thread, postponing while ``is_busy()``."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run_periodically, args=(interval_seconds, is_busy), name="archiver", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _run_periodically(self, interval_seconds: float, is_busy: Callable[[], bool]) -> None:
+        delay = min(self.FIRST_RUN_DELAY_SECONDS, interval_seconds)
+        while not self._stop_event.wait(delay):
+            if is_busy():
+                delay = min(self.BUSY_RETRY_SECONDS, interval_seconds)
+                continue
+            try:
+                self.run()
+            except Exception:  # noqa: BLE001
+                self.logger.exception("Archiving failed")
+            delay = interval_seconds
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from core.timing import PhaseSpan
+
+
+# Called right before the confirming step; returns a handle to report its outcome, or None to abort.
+ClaimBooking = Callable[[], Callable[[bool], None] | None]
+
+
+class BookingAborted(Exception):
+    """Raised inside a backend when the job's cancel event is set mid-booking."""
+
+
+def check_cancelled(cancel_event: threading.Event | None) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise BookingAborted
+
+
+@dataclass(slots=True)
+class BotResult:
+    ok: bool
+    message: str
+    cancelled: bool = False
+    # The slot itself is gone: retrying with another engine would not help.
+    unavailable: bool = False
+    timings: list[PhaseSpan] = field(default_factory=list)
+
+
+class BookingBackend(ABC):
+    """Engine that performs one booking against Playtomic for ReservationService."""
+
+    @abstractmethod
+    def reserve(
+        self,
+        email: str,
+        password: str,
+        base_url: str,
+        booking_fragment_url: str,
+        play_datetime_local: datetime,
+        booking_code: str,
+        max_retries: int = 2,
+        wait_for_release: Callable[[], bool] | None = None,
+        cancel_event: threading.Event | None = None,
+        claim_booking: ClaimBooking | None = None,
+    ) -> BotResult:
+        """Prepare the booking, wait for ``wait_for_release`` when given, then book.
+
+        Setting ``cancel_event`` aborts an in-flight booking with a cancelled result.
+        ``claim_booking`` is called right before the step that confirms the booking;
+        None aborts it the same way (a slot-group sibling already confirmed). The
+        handle it returns must be called with the outcome as soon as that step is
+        over, before any retry, so waiting siblings are not held up.
+        """
+
+    def close(self) -> None:
+        """Release pooled connections or browser sessions."""
+
+
+class FallbackBackend(BookingBackend):
+    """Tries ``primary`` first and repeats bookings that failed for engine reasons on ``fallback``."""
+
+    def __init__(self, primary: BookingBackend, fallback: BookingBackend, logger: logging.Logger) -> None:
+        self.primary = primary
+        self.fallback = fallback
+        self.logger = logger
+
+    def reserve(
+        self,
+        email: str,
+        password: str,
+        base_url: str,
+        booking_fragment_url: str,
+        play_datetime_local: datetime,
+        booking_code: str,
+        max_retries: int = 2,
+        wait_for_release: Callable[[], bool] | None = None,
+        cancel_event: threading.Event | None = None,
+        claim_booking: ClaimBooking | None = None,
+    ) -> BotResult:
+        released: list[bool] = []
+
+        def wait_once() -> bool:
+            released.append(wait_for_release())
+            return released[-1]
+
+        kwargs = dict(
+            email=email,
+            password=password,
+            base_url=base_url,
+            booking_fragment_url=booking_fragment_url,
+            play_datetime_local=play_datetime_local,
+            booking_code=booking_code,
+            max_retries=max_retries,
+            wait_for_release=wait_once if wait_for_release is not None else None,
+            cancel_event=cancel_event,
+            claim_booking=claim_booking,
+        )
+        result = self.primary.reserve(**kwargs)
+        if result.ok or result.cancelled or result.unavailable:
+            return result
+        self.logger.warning("Primary booking backend failed for %s (%s), falling back", email, result.message)
+        # Past the release instant the fallback books straight away; waiting again would skew the timings.
+        kwargs["wait_for_release"] = None if released else wait_for_release
+        fallback_result = self.fallback.reserve(**kwargs)
+        fallback_result.timings[:0] = result.timings
+        return fallback_result
+
+    def close(self) -> None:
+        self.primary.close()
+        self.fallback.close()
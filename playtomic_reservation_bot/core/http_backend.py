@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+from urllib.parse import unquote, urlencode
+
+import urllib3
+
+from core.booking_backend import BookingAborted, BookingBackend, BotResult, ClaimBooking, check_cancelled
+from core.timing import PhaseTimer
+
+
+class HttpBackendError(Exception):
+    def __init__(self, status: int, message: str, code: str | None = None) -> None:
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+        self.code = code
+
+
+class HttpBookingBackend(BookingBackend):
+    """Books through Playtomic's JSON API over a pooled keep-alive HTTP client.
+
+    Login and the slot lookup happen before ``wait_for_release``; at the release
+    instant only the booking request is sent. Endpoint paths are class attributes so
+    a different API version (or the local fake site) can be targeted.
+
+    The request contract (``/v1/availability?club=&court=&date=&time=`` returning a
+    ``slot_id``, then ``POST /v1/bookings {"slot_id"}``) is an assumption: it has only
+    been checked against ``benchmarks/fake_playtomic.py``, not against Playtomic.
+    """
+
+    LOGIN_PATH = "/v3/auth/login"
+    AVAILABILITY_PATH = "/v1/availability"
+    BOOKING_PATH = "/v1/bookings"
+    # Error code of the availability response that means the slot itself is gone.
+    SLOT_UNAVAILABLE_CODE = "slot_not_available"
+    TOKEN_TTL_SECONDS = 1800
+
+    def __init__(self, logger: logging.Logger, api_base_url: str, timeout_seconds: float = 10, pool_size: int = 8) -> None:
+        self.logger = logger
+        self.api_base_url = api_base_url.rstrip("/")
+        self.timeout = urllib3.Timeout(connect=min(timeout_seconds, 5), read=timeout_seconds)
+        self.http = urllib3.PoolManager(maxsize=pool_size, block=False, retries=False)
+        self._tokens: dict[str, tuple[str, float]] = {}
+        self._tokens_lock = threading.Lock()
+
+    def close(self) -> None:
+        self.http.clear()
+
+    def _request(self, method: str, path: str, body: dict | None = None, token: str | None = None) -> Any:
+        headers = {"Accept": "application/json"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        response = self.http.request(
+            method,
+            f"{self.api_base_url}{path}",
+            body=json.dumps(body) if body is not None else None,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        try:
+            payload = json.loads(response.data) if response.data else {}
+        except ValueError:
+            if response.status < 400:
+                raise
+            payload = {}  # e.g. an HTML error page from a proxy or an unknown path
+        if response.status >= 400:
+            raise HttpBackendError(
+                response.status, payload.get("message", response.reason or "error"), payload.get("code")
+            )
+        return payload
+
+    def _token(self, email: str, password: str) -> str:
+        with self._tokens_lock:
+            cached = self._tokens.get(email)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
+        payload = self._request("POST", self.LOGIN_PATH, {"email": email, "password": password})
+        token = payload["access_token"]
+        with self._tokens_lock:
+            self._tokens[email] = (token, time.monotonic() + self.TOKEN_TTL_SECONDS)
+        return token
+
+    def _forget_token(self, email: str) -> None:
+        with self._tokens_lock:
+            self._tokens.pop(email, None)
+
+    def _find_slot(self, token: str, base_url: str, booking_fragment_url: str, date_path: str, booking_code: str) -> str | None:
+        query = urlencode(
+            {"club": base_url, "court": booking_fragment_url, "date": date_path, "time": unquote(booking_code)}
+        )
+        try:
+            return self._request("GET", f"{self.AVAILABILITY_PATH}?{query}", token=token)["slot_id"]
+        except HttpBackendError as exc:
+            # Any other 404 (wrong path, retired API version) is an engine failure worth a browser retry.
+            if exc.status == 404 and exc.code == self.SLOT_UNAVAILABLE_CODE:
+                return None
+            raise
+
+    def reserve(
+        self,
+        email: str,
+        password: str,
+        base_url: str,
+        booking_fragment_url: str,
+        play_datetime_local: datetime,
+        booking_code: str,
+        max_retries: int = 2,
+        wait_for_release: Callable[[], bool] | None = None,
+        cancel_event: threading.Event | None = None,
+        claim_booking: ClaimBooking | None = None,
+    ) -> BotResult:
+        date_path = play_datetime_local.strftime("%Y-%m-%d")
+        timer = PhaseTimer()
+        for attempt in range(1, max_retries + 1):
+            try:
+                self.logger.info("HTTP attempt %s for %s", attempt, email)
+                with timer.span("login", attempt):
+                    token = self._token(email, password)
+                with timer.span("slot_lookup", attempt):
+                    slot_id = self._find_slot(token, base_url, booking_fragment_url, date_path, booking_code)
+
+                if wait_for_release is not None:
+                    with timer.span("release_wait", attempt):
+                        released = wait_for_release()
+                    wait_for_release = None
+                    if not released:
+                        return BotResult(
+                            ok=False, message="Cancelled before execution", cancelled=True, timings=timer.spans
+                        )
+
+                if slot_id is None:
+                    with timer.span("slot_lookup", attempt):
+                        slot_id = self._find_slot(token, base_url, booking_fragment_url, date_path, booking_code)
+                if slot_id is None:
+                    return BotResult(ok=False, message="Slot not available", unavailable=True, timings=timer.spans)
+                check_cancelled(cancel_event)
+                release_claim = None
+                if claim_booking is not None:
+                    with timer.span("group_claim", attempt):
+                        release_claim = claim_booking()
+                    if release_claim is None:
+                        raise BookingAborted
+                confirmed = False
+                try:
+                    with timer.span("book_request", attempt):
+                        booking = self._request("POST", self.BOOKING_PATH, {"slot_id": slot_id}, token=token)
+                    confirmed = True
+                finally:
+                    if release_claim is not None:
+                        release_claim(confirmed)
+
+                self.logger.info("Reservation succeeded for %s (booking %s)", email, booking.get("booking_id"))
+                return BotResult(ok=True, message="Reservation completed", timings=timer.spans)
+            except BookingAborted:
+                self.logger.info("Booking aborted for %s", email)
+                return BotResult(ok=False, message="Aborted", cancelled=True, timings=timer.spans)
+            except HttpBackendError as exc:
+                if exc.status == 401:
+                    self._forget_token(email)
+                if exc.status == 409:
+                    return BotResult(ok=False, message=f"Slot taken: {exc}", unavailable=True, timings=timer.spans)
+                self.logger.warning("HTTP error in attempt %s: %s", attempt, exc)
+                if attempt == max_retries:
+                    return BotResult(ok=False, message=str(exc), timings=timer.spans)
+            except Exception as exc:  # noqa: BLE001
+                self.logger.exception("Unhandled HTTP backend error")
+                if attempt == max_retries:
+                    return BotResult(ok=False, message=f"Unhandled error: {exc}", timings=timer.spans)
+        return BotResult(ok=False, message="Unknown error", timings=timer.spans)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+LOG_FORMATS = ("text", "json")
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(threadName)s %(message)s"
+CONTEXT_FIELDS = ("reservation_id", "account", "phase")
+
+_context: ContextVar[dict] = ContextVar("log_context", default={})
+
+
+@contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """Attach ``reservation_id``/``account``/``phase`` to every record logged inside the block."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Stamps records in the emitting thread, before they cross the queue."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.monotonic_ns = time.monotonic_ns()
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line with the reservation context and a monotonic timestamp."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "mono_ns": getattr(record, "monotonic_ns", None),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key in CONTEXT_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class PassThroughQueueHandler(QueueHandler):
+    """Queues records untouched; the stock ``prepare`` folds the traceback into ``msg`` and drops ``exc_info``."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def start_queue_logging(
+    logger: logging.Logger,
+    log_file: Path,
+    log_format: str = "text",
+    max_bytes: int = 5_000_000,
+    backup_count: int = 5,
+    console: bool = False,
+) -> QueueListener:
+    """Route ``logger`` through a queue so callers never block on file I/O; returns the started listener."""
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Invalid log format {log_format}")
+    formatter = JsonLinesFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+    file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    handlers: list[logging.Handler] = [file_handler]
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = PassThroughQueueHandler(records)
+    queue_handler.addFilter(ContextFilter())
+    logger.addHandler(queue_handler)
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -1,34 +1,189 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import re
+import threading
+from collections.abc import Callable
 from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from selenium import webdriver
-from selenium.common import TimeoutException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as ec
-from selenium.webdriver.support.ui import WebDriverWait
+from core.booking_backend import BookingAborted, BookingBackend, BotResult, ClaimBooking, check_cancelled
+from core.session_pool import DriverSessionPool, PooledSession
+from core.timing import PhaseTimer
 
+# Selenium is imported where a browser is actually needed: it is a large
+# package and most runs only touch it minutes or days after startup.
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.support.ui import WebDriverWait
 
-@dataclass(slots=True)
-class BotResult:
-    ok: bool
-    message: str
 
+def _login_form_or_redirect(driver: webdriver.Chrome) -> str | bool:
+    from selenium.webdriver.common.by import By
 
-class PlaytomicBot:
-    """Infrastructure class for Selenium automation against Playtomic."""
+    if "/users/login" not in driver.current_url:
+        return "redirected"
+    return "form" if driver.find_elements(By.NAME, "email") else False
 
-    def __init__(self, logger: logging.Logger, timeout_seconds: int = 20) -> None:
+
+def _until(wait: WebDriverWait, condition: Callable, cancel_event: threading.Event | None):
+    def check(driver: webdriver.Chrome):
+        check_cancelled(cancel_event)
+        return condition(driver)
+
+    return wait.until(check)
+
+
+class PlaytomicBot(BookingBackend):
+    """Infrastructure class for Selenium automation against Playtomic.
+
+    With ``profile_dir`` set, every account gets its own Chrome ``user-data-dir`` so a
+    fresh driver starts with the stored Playtomic session and only logs in when that
+    session turns out to be stale.
+    """
+
+    LOGIN_URL = "https://playtomic.io/users/login"
+    # Page element that reports the outcome after the confirm click, and its success text.
+    RESULT_SELECTOR = "[data-testid='booking-result']"
+    CONFIRMED_TEXT = "confirmed"
+    LAUNCH_PROFILES = ("standard", "performance")
+    # Third-party hosts and heavy assets that the booking flow never needs.
+    BLOCKED_URLS = [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*facebook.net*",
+        "*hotjar.com*",
+        "*segment.io*",
+        "*intercom.io*",
+        "*.woff",
+        "*.woff2",
+        "*.ttf",
+        "*.otf",
+    ]
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        timeout_seconds: int = 20,
+        session_max_uses: int = 20,
+        session_max_age_seconds: float = 1800,
+        profile_dir: Path | None = None,
+        launch_profile: str = "standard",
+        login_url: str = LOGIN_URL,
+    ) -> None:
+        if launch_profile not in self.LAUNCH_PROFILES:
+            raise ValueError(f"Invalid Chrome launch profile {launch_profile}")
         self.logger = logger
         self.timeout_seconds = timeout_seconds
+        self.launch_profile = launch_profile
+        self.login_url = login_url
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        # Chrome locks a user-data-dir, so each profile backs at most one live driver.
+        self._profile_owners: dict[str, webdriver.Chrome | None] = {}
+        self._profile_lock = threading.Lock()
+        self.sessions = DriverSessionPool(
+            build_driver=self._build_driver,
+            logger=logger,
+            max_uses=session_max_uses,
+            max_age_seconds=session_max_age_seconds,
+            on_quit=self._release_profile,
+        )
+
+    def close(self) -> None:
+        self.sessions.close_all()
+
+    def _profile_path(self, email: str) -> Path:
+        return self.profile_dir / re.sub(r"[^A-Za-z0-9_.-]", "_", email.lower())
+
+    def _build_options(self) -> Options:
+        from selenium.webdriver.chrome.options import Options
 
-    def _build_driver(self) -> webdriver.Chrome:
         options = Options()
-        options.add_argument("--start-maximized")
-        return webdriver.Chrome(options=options)
+        if self.launch_profile == "standard":
+            options.add_argument("--start-maximized")
+            return options
+
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1366,900")
+        options.page_load_strategy = "eager"
+        options.add_experimental_option(
+            "prefs",
+            {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            },
+        )
+        for flag in (
+            "--blink-settings=imagesEnabled=false",
+            "--disable-extensions",
+            "--disable-gpu",
+            "--disable-dev-shm-usage",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--no-first-run",
+            "--mute-audio",
+            "--renderer-process-limit=2",
+            "--js-flags=--max-old-space-size=256",
+        ):
+            options.add_argument(flag)
+        return options
+
+    def _start_chrome(self, options: Options) -> webdriver.Chrome:
+        from selenium import webdriver
+
+        driver = webdriver.Chrome(options=options)
+        if self.launch_profile == "performance":
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.BLOCKED_URLS})
+        return driver
+
+    def _build_driver(self, email: str) -> webdriver.Chrome:
+        options = self._build_options()
+        with self._profile_lock:
+            use_profile = self.profile_dir is not None and email not in self._profile_owners
+            if use_profile:
+                self._profile_owners[email] = None
+        if not use_profile:
+            return self._start_chrome(options)
+
+        profile = self._profile_path(email)
+        try:
+            profile.mkdir(parents=True, exist_ok=True)
+            options.add_argument(f"--user-data-dir={profile}")
+            driver = self._start_chrome(options)
+        except BaseException:
+            with self._profile_lock:
+                self._profile_owners.pop(email, None)
+            raise
+        with self._profile_lock:
+            self._profile_owners[email] = driver
+        return driver
+
+    def _release_profile(self, session: PooledSession) -> None:
+        with self._profile_lock:
+            if self._profile_owners.get(session.email) is session.driver:
+                del self._profile_owners[session.email]
+
+    def _login(self, session: PooledSession, wait: WebDriverWait, email: str, password: str) -> None:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as ec
+
+        driver = session.driver
+        driver.get(self.login_url)
+        if self._profile_owners.get(email) is driver:
+            # Stored profile: Playtomic redirects away from the login page when the session is still valid.
+            if wait.until(_login_form_or_redirect) == "redirected":
+                self.logger.info("Stored browser profile still logged in for %s", email)
+                return
+            self.logger.info("Stored browser profile stale for %s, logging in", email)
+        wait.until(ec.visibility_of_element_located((By.NAME, "email"))).send_keys(email)
+        wait.until(ec.visibility_of_element_located((By.NAME, "password"))).send_keys(password)
+        wait.until(ec.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']"))).click()
 
     def reserve(
         self,
@@ -39,38 +194,95 @@ class PlaytomicBot:
         play_datetime_local: datetime,
         booking_code: str,
         max_retries: int = 2,
+        wait_for_release: Callable[[], bool] | None = None,
+        cancel_event: threading.Event | None = None,
+        claim_booking: ClaimBooking | None = None,
     ) -> BotResult:
+        """Log in and open the booking page, then click book and confirm.
+
+        When ``wait_for_release`` is given, the session is prepared first and the
+        clicks only happen once it returns True; False cancels the booking.
+        Retries after the release go straight through. ``cancel_event`` is polled
+        between steps and while waiting for elements; ``claim_booking`` gates the
+        confirm click, whose result page must report the booking as confirmed.
+        """
+        from selenium.common import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as ec
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        timer = PhaseTimer()
         for attempt in range(1, max_retries + 1):
-            driver = None
+            session = None
+            healthy = True
             try:
                 self.logger.info("Bot attempt %s for %s", attempt, email)
-                driver = self._build_driver()
-                wait = WebDriverWait(driver, self.timeout_seconds)
+                check_cancelled(cancel_event)
+                with timer.span("driver_start", attempt):
+                    session = self.sessions.acquire(email)
+                driver = session.driver
+                wait = WebDriverWait(driver, self.timeout_seconds, poll_frequency=0.1)
 
-                driver.get("https://playtomic.io/users/login")
-                wait.until(ec.visibility_of_element_located((By.NAME, "email"))).send_keys(email)
-                wait.until(ec.visibility_of_element_located((By.NAME, "password"))).send_keys(password)
-                wait.until(ec.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']"))).click()
+                if not session.authenticated:
+                    with timer.span("login", attempt):
+                        self._login(session, wait, email, password)
+                    session.authenticated = True
 
                 date_path = play_datetime_local.strftime("%Y-%m-%d")
                 target_url = f"{base_url.rstrip('/')}/{booking_fragment_url.strip('/')}?date={date_path}&time={booking_code}"
                 self.logger.info("Opening booking URL %s", target_url)
-                driver.get(target_url)
+                check_cancelled(cancel_event)
+                with timer.span("page_load", attempt):
+                    driver.get(target_url)
+
+                if wait_for_release is not None:
+                    with timer.span("release_wait", attempt):
+                        released = wait_for_release()
+                    wait_for_release = None
+                    if not released:
+                        return BotResult(
+                            ok=False, message="Cancelled before execution", cancelled=True, timings=timer.spans
+                        )
 
-                wait.until(ec.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='book-button']"))).click()
-                wait.until(ec.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='confirm-booking']"))).click()
+                book = ec.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='book-button']"))
+                confirm = ec.element_to_be_clickable((By.CSS_SELECTOR, "button[data-testid='confirm-booking']"))
+                with timer.span("book_click", attempt):
+                    _until(wait, book, cancel_event).click()
+                booking_result = ec.visibility_of_element_located((By.CSS_SELECTOR, self.RESULT_SELECTOR))
+                release_claim = None
+                if claim_booking is not None:
+                    with timer.span("group_claim", attempt):
+                        release_claim = claim_booking()
+                    if release_claim is None:
+                        raise BookingAborted
+                confirmed = False
+                try:
+                    with timer.span("confirm_click", attempt):
+                        _until(wait, confirm, cancel_event).click()
+                        outcome = _until(wait, booking_result, cancel_event).text.strip()
+                    confirmed = outcome.lower() == self.CONFIRMED_TEXT
+                finally:
+                    if release_claim is not None:
+                        release_claim(confirmed)
+                if not confirmed:
+                    self.logger.warning("Booking not confirmed for %s: %s", email, outcome)
+                    return BotResult(ok=False, message=f"Slot taken: {outcome}", unavailable=True, timings=timer.spans)
 
                 self.logger.info("Reservation succeeded for %s", email)
-                return BotResult(ok=True, message="Reservation completed")
+                return BotResult(ok=True, message="Reservation completed", timings=timer.spans)
+            except BookingAborted:
+                self.logger.info("Booking aborted for %s", email)
+                return BotResult(ok=False, message="Aborted", cancelled=True, timings=timer.spans)
             except TimeoutException as exc:
                 self.logger.warning("Timeout in attempt %s: %s", attempt, exc)
                 if attempt == max_retries:
-                    return BotResult(ok=False, message=f"Timeout: {exc}")
+                    return BotResult(ok=False, message=f"Timeout: {exc}", timings=timer.spans)
             except Exception as exc:  # noqa: BLE001
+                healthy = False
                 self.logger.exception("Unhandled Selenium error")
                 if attempt == max_retries:
-                    return BotResult(ok=False, message=f"Unhandled error: {exc}")
+                    return BotResult(ok=False, message=f"Unhandled error: {exc}", timings=timer.spans)
             finally:
-                if driver is not None:
-                    driver.quit()
-        return BotResult(ok=False, message="Unknown error")
+                if session is not None:
+                    self.sessions.release(session, healthy=healthy)
+        return BotResult(ok=False, message="Unknown error", timings=timer.spans)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from core.time_controller import TimeController
+
+
+class ReleaseGate:
+    """Releases every reservation due at one instant together, highest priority first.
+
+    A single gate thread does the precise wait for the instant, then wakes the
+    prepared participants one after another in priority order. Participants only
+    poll their own cancel event during the last ``SETTLE_SECONDS``.
+    """
+
+    SETTLE_SECONDS = 1.0
+    POLL_SECONDS = 0.01
+
+    def __init__(self, instant: datetime, timer: TimeController, logger: logging.Logger) -> None:
+        self.instant = instant
+        self.timer = timer
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._participants: dict[int, tuple[int, threading.Event]] = {}
+        self._fired_ns: dict[int, int] = {}
+        self._done: set[int] = set()
+        self._released_ns: int | None = None
+        self._abort = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"release-{instant:%H%M%S}", daemon=True)
+        self._thread.start()
+
+    def join(self, reservation_id: int, priority: int) -> None:
+        with self._lock:
+            wake = threading.Event()
+            if self._released_ns is not None:
+                wake.set()
+            self._participants[reservation_id] = (priority, wake)
+
+    def wait(self, reservation_id: int, cancel_event: threading.Event) -> bool:
+        settle_at = self.instant - timedelta(seconds=self.SETTLE_SECONDS)
+        if not self.timer.wait_until(settle_at, cancel_event=cancel_event):
+            return False
+        wake = self._participants[reservation_id][1]
+        while not wake.wait(self.POLL_SECONDS):
+            if cancel_event.is_set():
+                return False
+        with self._lock:
+            self._fired_ns[reservation_id] = time.perf_counter_ns()
+        return True
+
+    def offset_ms(self, reservation_id: int) -> float | None:
+        """How long after the gate opened this participant was running again."""
+        with self._lock:
+            fired = self._fired_ns.get(reservation_id)
+            if fired is None or self._released_ns is None:
+                return None
+            return (fired - self._released_ns) / 1_000_000
+
+    def leave(self, reservation_id: int) -> bool:
+        """Mark a participant as finished; True once the gate has no one left to serve."""
+        with self._lock:
+            self._done.add(reservation_id)
+            if self._done < self._participants.keys():
+                return False
+        if self._released_ns is None:
+            self._abort.set()
+        else:
+            self._report()
+        return True
+
+    def _run(self) -> None:
+        if not self.timer.wait_until(self.instant, cancel_event=self._abort):
+            return
+        with self._lock:
+            self._released_ns = time.perf_counter_ns()
+            order = sorted(self._participants.items(), key=lambda item: (-item[1][0], item[0]))
+        for _, (_, wake) in order:
+            wake.set()
+
+    def _report(self) -> None:
+        with self._lock:
+            fired = sorted(self._fired_ns.values())
+        if not fired:
+            return
+        self.logger.info(
+            "Release %s: %s participants fired, fan-out skew %.2f ms",
+            self.instant.isoformat(),
+            len(fired),
+            (fired[-1] - fired[0]) / 1_000_000,
+        )
+
+
+class ReleaseOrchestrator:
+    """Groups reservation jobs by execution instant and hands out their shared ReleaseGate."""
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self.logger = logger
+        self._gates: dict[datetime, ReleaseGate] = {}
+        self._lock = threading.Lock()
+
+    def join(self, instant: datetime, reservation_id: int, priority: int, timer: TimeController) -> ReleaseGate:
+        with self._lock:
+            gate = self._gates.get(instant)
+            if gate is None:
+                gate = ReleaseGate(instant, timer, self.logger)
+                self._gates[instant] = gate
+            gate.join(reservation_id, priority)
+        return gate
+
+    def leave(self, gate: ReleaseGate, reservation_id: int) -> None:
+        with self._lock:
+            if gate.leave(reservation_id) and self._gates.get(gate.instant) is gate:
+                del self._gates[gate.instant]
@@ -1,19 +1,70 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from zoneinfo import ZoneInfo
 
+from core.booking_backend import BookingBackend, ClaimBooking
+from core.logging_setup import log_context
 from core.playtomic_bot import PlaytomicBot
+from core.release_orchestrator import ReleaseOrchestrator
+from core.slot_claims import SlotGroupClaims
 from core.time_controller import TimeController
 from core.time_converter import TimeZoneConverter
+from core.timing import PhaseSpan, PhaseTimer, percentile
 from database.db import Database
 
 
+@dataclass(slots=True)
+class ReservationChange:
+    reservation_id: int
+    status: str
+    execution_epoch_ms: int | None = None
+
+
+@dataclass(slots=True)
+class ReservationQuery:
+    """Filters for ``ReservationService.query_reservations``; ranges are on ``execution_epoch_ms``.
+
+    ``after`` is the keyset cursor ``(execution_epoch_ms, id)`` of the last row already
+    seen, as returned in ``ReservationPage.next_cursor``. ``descending`` pages from the
+    newest row backwards. ``archived`` reads the history moved to
+    ``reservations_archive`` instead of the live table.
+    """
+
+    statuses: tuple[str, ...] = ()
+    from_epoch_ms: int | None = None
+    to_epoch_ms: int | None = None
+    club_id: int | None = None
+    account_id: int | None = None
+    limit: int = 200
+    after: tuple[int, int] | None = None
+    descending: bool = False
+    archived: bool = False
+
+
+@dataclass(slots=True)
+class ReservationPage:
+    rows: list[dict] = field(default_factory=list)
+    next_cursor: tuple[int, int] | None = None
+
+
+def to_epoch_ms(moment: datetime) -> int:
+    return round(moment.timestamp() * 1000)
+
+
 class ReservationService:
     """Domain service for reservation lifecycle management."""
 
     VALID_STATUSES = {"Pending", "Waiting", "Running", "Success", "Failed", "Cancelled"}
+    ACTIVE_STATUSES = ("Pending", "Waiting", "Running")
+    FINISHED_STATUSES = ("Success", "Failed", "Cancelled")
 
     def __init__(
         self,
@@ -21,6 +72,8 @@ class ReservationService:
         logger: logging.Logger,
         local_tz: str,
         target_tz: str,
+        prewarm_seconds: float = 30,
+        bot: BookingBackend | None = None,
     ) -> None:
         self.db = db
         self.logger = logger
@@ -28,8 +81,29 @@ class ReservationService:
         self.target_tz = target_tz
         self.converter = TimeZoneConverter(local_tz=local_tz, target_tz=target_tz)
         self.timer = TimeController(local_tz=local_tz)
-        self.bot = PlaytomicBot(logger=logger)
+        self.bot = bot or PlaytomicBot(logger=logger)
+        self.prewarm_seconds = prewarm_seconds
+        self.release = ReleaseOrchestrator(logger)
+        self.claims = SlotGroupClaims(logger)
         self._zone = ZoneInfo(local_tz)
+        self._change_listeners: list[Callable[[ReservationChange], None]] = []
+
+    def close(self) -> None:
+        self.bot.close()
+
+    def add_change_listener(self, callback: Callable[[ReservationChange], None]) -> None:
+        self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[ReservationChange], None]) -> None:
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def _publish(self, change: ReservationChange) -> None:
+        for callback in list(self._change_listeners):
+            try:
+                callback(change)
+            except Exception:  # noqa: BLE001
+                self.logger.exception("Change listener failed for reservation %s", change.reservation_id)
 
     def refresh_timezones(self, local_tz: str, target_tz: str) -> None:
         self.local_tz = local_tz
@@ -38,7 +112,13 @@ class ReservationService:
         self.timer = TimeController(local_tz=local_tz)
         self._zone = ZoneInfo(local_tz)
 
-    def create_reservation(self, court_id: int, account_id: int, play_dt_local: datetime) -> int:
+    def epoch_ms(self, moment: datetime) -> int:
+        """UTC epoch milliseconds; naive datetimes are read in ``local_tz``."""
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=self._zone)
+        return to_epoch_ms(moment)
+
+    def create_reservation(self, court_id: int, account_id: int, play_dt_local: datetime, priority: int = 0) -> int:
         if play_dt_local.tzinfo is None:
             play_dt_local = play_dt_local.replace(tzinfo=self._zone)
         execution_dt = play_dt_local - timedelta(days=2)
@@ -53,39 +133,223 @@ class ReservationService:
         if duplicate:
             raise ValueError("Duplicate reservation for same account, court and datetime")
 
-        return self.db.execute(
+        reservation_id = self.db.execute(
             """
-            INSERT INTO reservations (court_id, account_id, play_datetime_local, execution_datetime_local, status)
-            VALUES (?, ?, ?, ?, 'Pending')
+            INSERT INTO reservations
+                (court_id, account_id, play_datetime_local, execution_datetime_local, status, priority,
+                 play_epoch_ms, execution_epoch_ms)
+            VALUES (?, ?, ?, ?, 'Pending', ?, ?, ?)
             """,
-            (court_id, account_id, play_dt_local.isoformat(), execution_dt.isoformat()),
+            (
+                court_id,
+                account_id,
+                play_dt_local.isoformat(),
+                execution_dt.isoformat(),
+                priority,
+                to_epoch_ms(play_dt_local),
+                to_epoch_ms(execution_dt),
+            ),
         )
+        self._publish(ReservationChange(reservation_id, "Pending", to_epoch_ms(execution_dt)))
+        return reservation_id
 
-    def list_reservations(self) -> list[dict]:
+    def create_slot_group(
+        self, court_ids: list[int], account_ids: list[int], play_dt_local: datetime, priority: int = 0
+    ) -> int:
+        """Hedge one slot across several courts and/or accounts; the first confirmation wins."""
+        if play_dt_local.tzinfo is None:
+            play_dt_local = play_dt_local.replace(tzinfo=self._zone)
+        execution_dt = play_dt_local - timedelta(days=2)
+        members = [(court_id, account_id) for court_id in dict.fromkeys(court_ids) for account_id in dict.fromkeys(account_ids)]
+        if len(members) < 2:
+            raise ValueError("A slot group needs at least two court/account combinations")
+
+        reservation_ids = []
+        with self.db.transaction() as conn:
+            group_id = conn.execute("INSERT INTO reservation_groups (status) VALUES ('Pending')").lastrowid
+            for court_id, account_id in members:
+                duplicate = conn.execute(
+                    """
+                    SELECT id FROM reservations
+                    WHERE court_id = ? AND account_id = ? AND play_datetime_local = ?
+                    """,
+                    (court_id, account_id, play_dt_local.isoformat()),
+                ).fetchone()
+                if duplicate:
+                    raise ValueError("Duplicate reservation for same account, court and datetime")
+                cursor = conn.execute(
+                    """
+                    INSERT INTO reservations
+                        (court_id, account_id, play_datetime_local, execution_datetime_local, status, group_id,
+                         priority, play_epoch_ms, execution_epoch_ms)
+                    VALUES (?, ?, ?, ?, 'Pending', ?, ?, ?, ?)
+                    """,
+                    (
+                        court_id,
+                        account_id,
+                        play_dt_local.isoformat(),
+                        execution_dt.isoformat(),
+                        group_id,
+                        priority,
+                        to_epoch_ms(play_dt_local),
+                        to_epoch_ms(execution_dt),
+                    ),
+                )
+                reservation_ids.append(cursor.lastrowid)
+
+        self.logger.info("Slot group %s created with reservations %s", group_id, reservation_ids)
+        for reservation_id in reservation_ids:
+            self._publish(ReservationChange(reservation_id, "Pending", to_epoch_ms(execution_dt)))
+        return group_id
+
+    def cancel_group(self, group_id: int) -> None:
         rows = self.db.fetchall(
-            """
+            "SELECT id FROM reservations WHERE group_id = ? AND status IN (?, ?, ?)",
+            (group_id, *self.ACTIVE_STATUSES),
+        )
+        for row in rows:
+            self.cancel_reservation(row["id"])
+        self._settle_group(group_id)
+
+    def get_group(self, group_id: int) -> dict | None:
+        row = self.db.fetchone(
+            "SELECT id, status, winner_reservation_id, created_at FROM reservation_groups WHERE id = ?",
+            (group_id,),
+        )
+        return dict(row) if row else None
+
+    def _settle_group(self, group_id: int) -> None:
+        """Derive the group outcome from its members and cancel the losers once one has won."""
+        with self.db.transaction() as conn:
+            group = conn.execute(
+                "SELECT status, winner_reservation_id FROM reservation_groups WHERE id = ?", (group_id,)
+            ).fetchone()
+            members = conn.execute("SELECT id, status FROM reservations WHERE group_id = ?", (group_id,)).fetchall()
+            winners = [m["id"] for m in members if m["status"] == "Success"]
+            active = [m["id"] for m in members if m["status"] in self.ACTIVE_STATUSES]
+            if winners:
+                status = "Success"
+            elif active:
+                return
+            elif all(m["status"] == "Cancelled" for m in members):
+                status = "Cancelled"
+            else:
+                status = "Failed"
+            # Recorded by _record_success; older groups fall back to any confirmed member.
+            winner = (group and group["winner_reservation_id"]) or (winners[0] if winners else None)
+            changed = group is not None and group["status"] != status
+            if changed:
+                conn.execute(
+                    "UPDATE reservation_groups SET status = ?, winner_reservation_id = ? WHERE id = ?",
+                    (status, winner, group_id),
+                )
+            losers = active if winners else []
+            # Cancel inside the write transaction so a sibling's concurrent Success is never overwritten.
+            conn.executemany("UPDATE reservations SET status = 'Cancelled' WHERE id = ?", [(i,) for i in losers])
+
+        if len(winners) > 1:
+            self.logger.warning("Slot group %s confirmed more than once: reservations %s", group_id, winners)
+        for reservation_id in losers:
+            self._publish(ReservationChange(reservation_id, "Cancelled"))
+        if changed:
+            self.logger.info(
+                "Slot group %s result: %s (winner %s, %s members)",
+                group_id,
+                status,
+                winner,
+                len(members),
+            )
+
+    def list_pending_jobs(self) -> list[tuple[int, int]]:
+        """``(execution_epoch_ms, id)`` of every Pending job, read from the status/epoch index."""
+        rows = self.db.fetchall(
+            "SELECT id, execution_epoch_ms FROM reservations WHERE status = 'Pending' ORDER BY execution_epoch_ms"
+        )
+        return [(row["execution_epoch_ms"], row["id"]) for row in rows]
+
+    def next_pending_epoch_ms(self) -> int | None:
+        row = self.db.fetchone("SELECT MIN(execution_epoch_ms) AS due FROM reservations WHERE status = 'Pending'")
+        return row["due"] if row else None
+
+    def query_reservations(self, query: ReservationQuery) -> ReservationPage:
+        """One page of reservations ordered by ``(execution_epoch_ms, id)``, or its reverse."""
+        conditions, params = [], []
+        if query.statuses:
+            conditions.append(f"r.status IN ({', '.join('?' for _ in query.statuses)})")
+            params.extend(query.statuses)
+        if query.from_epoch_ms is not None:
+            conditions.append("r.execution_epoch_ms >= ?")
+            params.append(query.from_epoch_ms)
+        if query.to_epoch_ms is not None:
+            conditions.append("r.execution_epoch_ms < ?")
+            params.append(query.to_epoch_ms)
+        if query.club_id is not None:
+            conditions.append("c.club_id = ?")
+            params.append(query.club_id)
+        if query.account_id is not None:
+            conditions.append("r.account_id = ?")
+            params.append(query.account_id)
+        if query.after is not None:
+            conditions.append(f"(r.execution_epoch_ms, r.id) {'<' if query.descending else '>'} (?, ?)")
+            params.extend(query.after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        direction = "DESC" if query.descending else "ASC"
+        # Archived rows may outlive the court or account they referenced.
+        table, join = ("reservations_archive", "LEFT JOIN") if query.archived else ("reservations", "JOIN")
+        rows = self.db.fetchall(
+            f"""
             SELECT r.id, c.name AS court_name, a.email, r.play_datetime_local,
-                   r.execution_datetime_local, r.status, r.created_at
-            FROM reservations r
-            JOIN courts c ON c.id = r.court_id
-            JOIN accounts a ON a.id = r.account_id
-            ORDER BY r.execution_datetime_local ASC
-            """
+                   r.execution_datetime_local, r.execution_epoch_ms, r.status, r.created_at, r.group_id
+            FROM {table} r
+            {join} courts c ON c.id = r.court_id
+            {join} accounts a ON a.id = r.account_id
+            {where}
+            ORDER BY r.execution_epoch_ms {direction}, r.id {direction}
+            LIMIT ?
+            """,
+            (*params, query.limit),
+        )
+        page = ReservationPage([dict(row) for row in rows])
+        if len(page.rows) == query.limit:
+            last = page.rows[-1]
+            page.next_cursor = (last["execution_epoch_ms"], last["id"])
+        return page
+
+    def iter_reservations(self, query: ReservationQuery | None = None) -> Iterator[dict]:
+        """Stream every matching row, one keyset page at a time."""
+        query = query or ReservationQuery()
+        while True:
+            page = self.query_reservations(query)
+            yield from page.rows
+            if page.next_cursor is None:
+                return
+            query = replace(query, after=page.next_cursor)
+
+    def list_reservations(self) -> list[dict]:
+        return list(self.iter_reservations())
+
+    def get_statuses(self, reservation_ids: list[int]) -> dict[int, str]:
+        if not reservation_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in reservation_ids)
+        rows = self.db.fetchall(
+            f"SELECT id, status FROM reservations WHERE id IN ({placeholders})", tuple(reservation_ids)
         )
-        return [dict(row) for row in rows]
+        return {row["id"]: row["status"] for row in rows}
 
     def set_status(self, reservation_id: int, status: str) -> None:
         if status not in self.VALID_STATUSES:
             raise ValueError(f"Invalid reservation status {status}")
         self.db.execute("UPDATE reservations SET status = ? WHERE id = ?", (status, reservation_id))
+        self._publish(ReservationChange(reservation_id, status))
 
     def cancel_reservation(self, reservation_id: int) -> None:
         self.set_status(reservation_id, "Cancelled")
 
-    def execute_reservation(self, reservation_id: int, cancel_check: callable) -> None:
+    def execute_reservation(self, reservation_id: int, cancel_event: threading.Event) -> None:
         row = self.db.fetchone(
             """
-            SELECT r.id, r.play_datetime_local, r.execution_datetime_local,
+            SELECT r.id, r.play_datetime_local, r.execution_epoch_ms, r.status, r.group_id, r.priority,
                    c.booking_fragment_url, cl.base_url,
                    a.email, a.password, a.active
             FROM reservations r
@@ -100,24 +364,47 @@ class ReservationService:
             self.logger.error("Reservation %s not found", reservation_id)
             return
 
+        if not self._claim_job(reservation_id):
+            return
+
+        try:
+            with log_context(reservation_id=reservation_id, account=row["email"]):
+                self._execute(row, cancel_event)
+        finally:
+            if row["group_id"] is not None:
+                self._settle_group(row["group_id"])
+
+    def _claim_job(self, reservation_id: int) -> bool:
+        """Move Pending to Waiting atomically, so a second scheduler (GUI and CLI daemon) skips the job."""
+        with self.db.transaction() as conn:
+            claimed = conn.execute(
+                "UPDATE reservations SET status = 'Waiting' WHERE id = ? AND status = 'Pending'", (reservation_id,)
+            ).rowcount
+        if not claimed:
+            status = self.get_statuses([reservation_id]).get(reservation_id)
+            self.logger.info("Reservation %s skipped: status is %s", reservation_id, status)
+            return False
+        self._publish(ReservationChange(reservation_id, "Waiting"))
+        return True
+
+    def _execute(self, row: sqlite3.Row, cancel_event: threading.Event) -> None:
+        reservation_id = row["id"]
+        group_id = row["group_id"]
         if row["active"] == 0:
             self.logger.error("Reservation %s failed: account inactive", reservation_id)
             self.set_status(reservation_id, "Failed")
             return
 
         play_dt = datetime.fromisoformat(row["play_datetime_local"])
-        execution_dt = datetime.fromisoformat(row["execution_datetime_local"])
+        execution_dt = datetime.fromtimestamp(row["execution_epoch_ms"] / 1000, self._zone)
 
         self.logger.info("Reservation %s waiting until %s", reservation_id, execution_dt.isoformat())
-        self.set_status(reservation_id, "Waiting")
 
-        wait_ok = self.timer.wait_until(execution_dt, cancel_check=cancel_check)
-        if not wait_ok:
-            self.logger.info("Reservation %s cancelled before execution", reservation_id)
-            self.set_status(reservation_id, "Cancelled")
+        prewarm_dt = execution_dt - timedelta(seconds=self.prewarm_seconds)
+        if not self.timer.wait_until(prewarm_dt, cancel_event=cancel_event):
+            self._interrupted(reservation_id)
             return
 
-        self.set_status(reservation_id, "Running")
         booking_code = self.converter.generate_booking_code(play_dt)
         self.logger.info(
             "Reservation %s timezone conversion local=%s booking_code=%s",
@@ -126,14 +413,119 @@ class ReservationService:
             booking_code,
         )
 
-        result = self.bot.reserve(
-            email=row["email"],
-            password=row["password"],
-            base_url=row["base_url"],
-            booking_fragment_url=row["booking_fragment_url"],
-            play_datetime_local=play_dt,
-            booking_code=booking_code,
+        spans = PhaseTimer()
+        released_at_ns: list[int] = []
+        # Every job due at the same instant shares one gate: a single precise wait, then a priority-ordered release.
+        gate = self.release.join(execution_dt, reservation_id, row["priority"], self.timer)
+
+        def wait_for_release() -> bool:
+            if not gate.wait(reservation_id, cancel_event):
+                return False
+            released_at_ns.append(time.perf_counter_ns())
+            spans.record("scheduler_lateness", (datetime.now(timezone.utc) - execution_dt).total_seconds() * 1000)
+            spans.record("release_offset", gate.offset_ms(reservation_id))
+            return True
+
+        self.logger.info("Reservation %s pre-warming browser session", reservation_id)
+        self.set_status(reservation_id, "Running")
+        claim_booking: ClaimBooking | None = None
+        if group_id is not None:
+            # Only one member of a slot group may send its confirmation at a time.
+            self.claims.join(group_id, reservation_id)
+            claim_booking = partial(self.claims.claim, group_id, reservation_id, cancel_event)
+        result = None
+        try:
+            result = self.bot.reserve(
+                email=row["email"],
+                password=row["password"],
+                base_url=row["base_url"],
+                booking_fragment_url=row["booking_fragment_url"],
+                play_datetime_local=play_dt,
+                booking_code=booking_code,
+                wait_for_release=wait_for_release,
+                cancel_event=cancel_event,
+                claim_booking=claim_booking,
+            )
+        finally:
+            self.release.leave(gate, reservation_id)
+            if group_id is not None:
+                self.claims.leave(group_id, reservation_id, confirmed=result is not None and result.ok)
+
+        if released_at_ns:
+            spans.record("booking_total", (time.perf_counter_ns() - released_at_ns[0]) / 1_000_000)
+
+        if result.cancelled and not released_at_ns:
+            self._interrupted(reservation_id)
+        elif result.cancelled:
+            self.logger.info("Reservation %s cancelled: %s", reservation_id, result.message)
+            self.set_status(reservation_id, "Cancelled")
+        elif result.ok:
+            self._record_success(reservation_id, group_id)
+            self.logger.info("Reservation %s result: %s", reservation_id, result.message)
+        else:
+            self.set_status(reservation_id, "Failed")
+            self.logger.info("Reservation %s result: %s", reservation_id, result.message)
+        self._record_timings(reservation_id, result.timings + spans.spans)
+
+    def _record_success(self, reservation_id: int, group_id: int | None) -> None:
+        """Mark a confirmed booking; the first slot-group member to get here is the group's winner."""
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE reservations SET status = 'Success' WHERE id = ?", (reservation_id,))
+            if group_id is not None:
+                conn.execute(
+                    "UPDATE reservation_groups SET winner_reservation_id = ? WHERE id = ? AND winner_reservation_id IS NULL",
+                    (reservation_id, group_id),
+                )
+        self._publish(ReservationChange(reservation_id, "Success"))
+
+    def _interrupted(self, reservation_id: int) -> None:
+        """A job stopped before its release instant: keep user cancellations, requeue shutdowns."""
+        if self.get_statuses([reservation_id]).get(reservation_id) == "Cancelled":
+            self.logger.info("Reservation %s cancelled before execution", reservation_id)
+            return
+        self.logger.info("Reservation %s interrupted by shutdown, back to Pending", reservation_id)
+        self.set_status(reservation_id, "Pending")
+
+    def _record_timings(self, reservation_id: int, spans: list[PhaseSpan]) -> None:
+        self.db.executemany(
+            "INSERT INTO reservation_timings (reservation_id, attempt, phase, duration_ms) VALUES (?, ?, ?, ?)",
+            [(reservation_id, span.attempt, span.phase, span.duration_ms) for span in spans],
+        )
+        self.logger.info(
+            "Reservation %s timings: %s",
+            reservation_id,
+            ", ".join(f"{span.phase}#{span.attempt}={span.duration_ms:.1f}ms" for span in spans),
         )
 
-        self.set_status(reservation_id, "Success" if result.ok else "Failed")
-        self.logger.info("Reservation %s result: %s", reservation_id, result.message)
+    def phase_latency_report(self, club_id: int | None = None, include_archive: bool = False) -> list[dict]:
+        """p50/p95 duration of every recorded phase, per club."""
+        sources = [("reservation_timings", "reservations")]
+        if include_archive:
+            sources.append(("reservation_timings_archive", "reservations_archive"))
+        rows = self.db.fetchall(
+            " UNION ALL ".join(
+                f"""
+                SELECT cl.name AS club_name, t.phase, t.duration_ms
+                FROM {timings} t
+                JOIN {reservations} r ON r.id = t.reservation_id
+                JOIN courts c ON c.id = r.court_id
+                JOIN clubs cl ON cl.id = c.club_id
+                WHERE ? IS NULL OR cl.id = ?
+                """
+                for timings, reservations in sources
+            ),
+            (club_id, club_id) * len(sources),
+        )
+        samples: dict[tuple[str, str], list[float]] = {}
+        for row in rows:
+            samples.setdefault((row["club_name"], row["phase"]), []).append(row["duration_ms"])
+        return [
+            {
+                "club_name": club_name,
+                "phase": phase,
+                "samples": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+            }
+            for (club_name, phase), values in sorted(samples.items())
+        ]
@@ -1,74 +1,201 @@
 from __future__ import annotations
 
+import heapq
 import threading
 import time
-from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 
-from core.reservation_service import ReservationService
+from core.reservation_service import ReservationChange, ReservationService
+
+
+@dataclass(slots=True)
+class PoolStats:
+    max_workers: int
+    active: int
+    queued: int
+
+    @property
+    def utilization(self) -> float:
+        return self.active / self.max_workers
 
 
 class ReservationScheduler:
-    """Thread-based scheduler for pending reservations."""
+    """Deadline-driven scheduler for pending reservations.
+
+    Pending jobs are loaded once into a min-heap keyed on their execution time and
+    kept current through the service's change notifications; the loop sleeps until
+    the next job is due instead of polling the database. Due jobs are handed
+    ``lead_seconds`` early to a bounded worker pool, which does the final wait.
+    A job that finds the pool full runs on its own overflow thread instead of
+    queueing, so a busy pool never pushes a prepared job past its instant.
+    """
 
-    def __init__(self, service: ReservationService) -> None:
+    MAX_IDLE_SECONDS = 60
+
+    def __init__(self, service: ReservationService, max_workers: int = 8, lead_seconds: float = 60) -> None:
         self.service = service
+        self.max_workers = max_workers
+        self.lead_ms = round(lead_seconds * 1000)
         self._worker_thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._active_workers = 0
         self._stop_event = threading.Event()
-        self._running_jobs: dict[int, tuple[threading.Thread, threading.Event]] = {}
+        self._running_jobs: dict[int, tuple[Future, threading.Event]] = {}
+        self._overflow_threads: dict[int, threading.Thread] = {}
         self._lock = threading.RLock()
-        self._status_callback: Callable[[], None] | None = None
-
-    def set_status_callback(self, callback: Callable[[], None]) -> None:
-        self._status_callback = callback
+        self._wakeup = threading.Condition(self._lock)
+        # Both keyed on execution_epoch_ms (UTC milliseconds).
+        self._heap: list[tuple[int, int]] = []
+        self._queued: dict[int, int] = {}
+        self.service.add_change_listener(self._on_change)
 
     def start(self) -> None:
         if self._worker_thread and self._worker_thread.is_alive():
             return
         self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="reservation")
+        self._load_pending()
         self._worker_thread = threading.Thread(target=self._run_loop, daemon=True)
         self._worker_thread.start()
 
-    def stop(self) -> None:
+    def stop(self, wait: bool = False) -> None:
+        """Cancel running jobs; ``wait`` blocks until they have written their final status.
+
+        Safe to call again with ``wait=True`` after a non-blocking stop.
+        """
         self._stop_event.set()
-        with self._lock:
+        with self._wakeup:
             for _, cancel_event in self._running_jobs.values():
                 cancel_event.set()
+            self._wakeup.notify_all()
+            executor = self._executor
+            overflow = list(self._overflow_threads.values())
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        if wait:
+            for thread in overflow:
+                thread.join()
+
+    def reload(self) -> None:
+        """Resync with the database after writes made by another process."""
+        self._load_pending()
+        with self._lock:
+            running = list(self._running_jobs)
+        for reservation_id, status in self.service.get_statuses(running).items():
+            if status == "Cancelled":
+                self._on_change(ReservationChange(reservation_id, status))
+
+    def pool_stats(self) -> PoolStats:
+        with self._lock:
+            active = self._active_workers
+            return PoolStats(self.max_workers, active, max(len(self._running_jobs) - active, 0))
 
     def cancel_reservation(self, reservation_id: int) -> None:
         self.service.cancel_reservation(reservation_id)
-        with self._lock:
-            job = self._running_jobs.get(reservation_id)
-            if job:
-                job[1].set()
+
+    def cancel_group(self, group_id: int) -> None:
+        self.service.cancel_group(group_id)
+
+    def _load_pending(self) -> None:
+        jobs = self.service.list_pending_jobs()
+        with self._wakeup:
+            self._queued = {res_id: due_ms for due_ms, res_id in jobs if res_id not in self._running_jobs}
+            self._heap = [(due_ms, res_id) for res_id, due_ms in self._queued.items()]
+            heapq.heapify(self._heap)
+            self._wakeup.notify_all()
+
+    def _on_change(self, change: ReservationChange) -> None:
+        with self._wakeup:
+            if change.status == "Pending" and change.execution_epoch_ms is not None:
+                self._queued[change.reservation_id] = change.execution_epoch_ms
+                heapq.heappush(self._heap, (change.execution_epoch_ms, change.reservation_id))
+                self._wakeup.notify_all()
+                return
+            if change.status == "Cancelled":
+                self._queued.pop(change.reservation_id, None)
+                job = self._running_jobs.get(change.reservation_id)
+                if job:
+                    job[1].set()
+
+    def _pop_due(self, now_ms: int) -> list[int]:
+        due = []
+        while self._heap and self._heap[0][0] - self.lead_ms <= now_ms:
+            due_ms, res_id = heapq.heappop(self._heap)
+            # Entries dropped from _queued (cancelled or re-queued) are discarded lazily.
+            if self._queued.get(res_id) != due_ms:
+                continue
+            del self._queued[res_id]
+            if res_id not in self._running_jobs:
+                due.append(res_id)
+        return due
+
+    def _seconds_until_next(self, now_ms: int) -> float:
+        if not self._heap:
+            return self.MAX_IDLE_SECONDS
+        remaining = (self._heap[0][0] - self.lead_ms - now_ms) / 1000
+        return min(max(remaining, 0), self.MAX_IDLE_SECONDS)
 
     def _run_loop(self) -> None:
         while not self._stop_event.is_set():
-            reservations = self.service.list_reservations()
-            for row in reservations:
-                res_id = row["id"]
-                status = row["status"]
-                if status != "Pending":
+            with self._wakeup:
+                now_ms = time.time_ns() // 1_000_000
+                due = self._pop_due(now_ms)
+                if not due:
+                    self._wakeup.wait(self._seconds_until_next(now_ms))
                     continue
-                with self._lock:
-                    if res_id in self._running_jobs:
-                        continue
-                    cancel_event = threading.Event()
-                    thread = threading.Thread(
-                        target=self._run_reservation,
-                        args=(res_id, cancel_event),
-                        daemon=True,
-                    )
-                    self._running_jobs[res_id] = (thread, cancel_event)
-                    thread.start()
-            if self._status_callback:
-                self._status_callback()
-            time.sleep(1)
+                for res_id in due:
+                    self._dispatch(res_id)
+
+    def _dispatch(self, reservation_id: int) -> None:
+        if self._executor is None or self._stop_event.is_set():
+            return
+        cancel_event = threading.Event()
+        pooled = len(self._running_jobs) - len(self._overflow_threads)
+        if pooled < self.max_workers:
+            future = self._executor.submit(self._run_reservation, reservation_id, cancel_event)
+            self.service.logger.info(
+                "Reservation %s dispatched (%s/%s workers in use)", reservation_id, pooled + 1, self.max_workers
+            )
+        else:
+            # Waiting in the executor queue would start the job after its release instant.
+            future = self._start_overflow(reservation_id, cancel_event)
+            self.service.logger.warning(
+                "Reservation %s on an overflow thread: worker pool saturated (%s jobs for %s workers)",
+                reservation_id,
+                len(self._running_jobs) + 1,
+                self.max_workers,
+            )
+        self._running_jobs[reservation_id] = (future, cancel_event)
+        future.add_done_callback(lambda _: self._job_done(reservation_id))
+
+    def _start_overflow(self, reservation_id: int, cancel_event: threading.Event) -> Future:
+        future: Future = Future()
+
+        def run() -> None:
+            future.set_running_or_notify_cancel()
+            try:
+                self._run_reservation(reservation_id, cancel_event)
+            except BaseException as exc:  # noqa: BLE001
+                future.set_exception(exc)
+            else:
+                future.set_result(None)
+
+        thread = threading.Thread(target=run, name=f"reservation-overflow-{reservation_id}", daemon=True)
+        self._overflow_threads[reservation_id] = thread
+        thread.start()
+        return future
 
     def _run_reservation(self, reservation_id: int, cancel_event: threading.Event) -> None:
+        with self._lock:
+            self._active_workers += 1
         try:
-            self.service.execute_reservation(reservation_id, cancel_check=cancel_event.is_set)
+            self.service.execute_reservation(reservation_id, cancel_event=cancel_event)
         finally:
             with self._lock:
-                self._running_jobs.pop(reservation_id, None)
-            if self._status_callback:
-                self._status_callback()
+                self._active_workers -= 1
+
+    def _job_done(self, reservation_id: int) -> None:
+        with self._lock:
+            self._running_jobs.pop(reservation_id, None)
+            self._overflow_threads.pop(reservation_id, None)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class PooledSession:
+    email: str
+    driver: Any
+    created_at: float = field(default_factory=time.monotonic)
+    uses: int = 0
+    authenticated: bool = False
+
+
+class DriverSessionPool:
+    """Keeps WebDriver sessions alive per account so retries and later bookings skip startup and login.
+
+    While any session sits idle, a reaper thread quits the ones past ``max_uses`` or
+    ``max_age_seconds`` every ``REAP_INTERVAL_SECONDS``, whatever account they belong to.
+    """
+
+    REAP_INTERVAL_SECONDS = 60
+
+    def __init__(
+        self,
+        build_driver: Callable[[str], Any],
+        logger: logging.Logger,
+        max_uses: int = 20,
+        max_age_seconds: float = 1800,
+        max_idle_per_account: int = 2,
+        on_quit: Callable[[PooledSession], None] | None = None,
+    ) -> None:
+        self.build_driver = build_driver
+        self.logger = logger
+        self.on_quit = on_quit
+        self.max_uses = max_uses
+        self.max_age_seconds = max_age_seconds
+        self.max_idle_per_account = max_idle_per_account
+        self._idle: dict[str, list[PooledSession]] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reaper: threading.Thread | None = None
+
+    def acquire(self, email: str) -> PooledSession:
+        while True:
+            with self._lock:
+                idle = self._idle.get(email)
+                session = idle.pop() if idle else None
+            if session is None:
+                self.logger.info("Starting new browser session for %s", email)
+                session = PooledSession(email=email, driver=self.build_driver(email))
+                break
+            if not self._expired(session) and self._healthy(session):
+                self.logger.info("Reusing browser session for %s (use %s)", email, session.uses + 1)
+                break
+            self._quit(session)
+        session.uses += 1
+        return session
+
+    def release(self, session: PooledSession, healthy: bool = True) -> None:
+        self.reap_expired()
+        if not healthy or self._expired(session) or self._closed.is_set():
+            self._quit(session)
+            return
+        with self._lock:
+            idle = self._idle.setdefault(session.email, [])
+            if len(idle) < self.max_idle_per_account:
+                idle.append(session)
+                if self._reaper is None:
+                    self._reaper = threading.Thread(target=self._reap_loop, name="session-reaper", daemon=True)
+                    self._reaper.start()
+                return
+        self._quit(session)
+
+    def reap_expired(self) -> bool:
+        """Quit expired idle sessions of every account; True while others stay idle."""
+        with self._lock:
+            expired = []
+            for email, idle in list(self._idle.items()):
+                expired += [s for s in idle if self._expired(s)]
+                idle[:] = [s for s in idle if not self._expired(s)]
+                if not idle:
+                    del self._idle[email]
+            remaining = bool(self._idle)
+        for session in expired:
+            self.logger.info("Closing expired idle browser session for %s", session.email)
+            self._quit(session)
+        return remaining
+
+    def close_all(self) -> None:
+        self._closed.set()
+        with self._lock:
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+        for session in sessions:
+            self._quit(session)
+
+    def _reap_loop(self) -> None:
+        while not self._closed.wait(self.REAP_INTERVAL_SECONDS):
+            self.reap_expired()
+            with self._lock:
+                # Decided under the lock so a concurrent release either sees this thread or starts a new one.
+                if not self._idle:
+                    self._reaper = None
+                    return
+
+    def _expired(self, session: PooledSession) -> bool:
+        return session.uses >= self.max_uses or time.monotonic() - session.created_at >= self.max_age_seconds
+
+    def _healthy(self, session: PooledSession) -> bool:
+        try:
+            session.driver.current_url  # noqa: B018 - round-trip to the driver
+            return True
+        except Exception:  # noqa: BLE001
+            self.logger.warning("Discarding unresponsive browser session for %s", session.email)
+            return False
+
+    def _quit(self, session: PooledSession) -> None:
+        try:
+            session.driver.quit()
+        except Exception:  # noqa: BLE001
+            self.logger.debug("Browser session for %s already gone", session.email)
+        if self.on_quit is not None:
+            self.on_quit(session)
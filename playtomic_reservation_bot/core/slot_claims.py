@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import partial
+
+
+@dataclass(slots=True)
+class _GroupState:
+    members: set[int] = field(default_factory=set)
+    holder: int | None = None
+    confirmed: bool = False
+
+
+class SlotGroupClaims:
+    """Lets one member of a slot group at a time take the final, irreversible booking step.
+
+    A member calls ``claim`` right before sending the booking and gets back a release
+    handle, which the backend calls with the outcome as soon as that one step is over,
+    before any retry or fallback. Siblings wait at most ``WAIT_SECONDS`` for it: a
+    confirmation makes them give up, a failure hands the claim to the next one, and a
+    holder that is still busy after the bound is overtaken so the hedge stays fast.
+    """
+
+    POLL_SECONDS = 0.02
+    WAIT_SECONDS = 0.3
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self.logger = logger
+        self._changed = threading.Condition()
+        self._groups: dict[int, _GroupState] = {}
+
+    def join(self, group_id: int, reservation_id: int) -> None:
+        with self._changed:
+            self._groups.setdefault(group_id, _GroupState()).members.add(reservation_id)
+
+    def claim(
+        self, group_id: int, reservation_id: int, cancel_event: threading.Event
+    ) -> Callable[[bool], None] | None:
+        """Release handle for the final step; None if a sibling confirmed or the job was cancelled."""
+        deadline = time.monotonic() + self.WAIT_SECONDS
+        with self._changed:
+            state = self._groups[group_id]
+            while True:
+                if cancel_event.is_set() or state.confirmed:
+                    return None
+                if state.holder in (None, reservation_id):
+                    state.holder = reservation_id
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.logger.warning(
+                        "Slot group %s: reservation %s goes ahead while %s still holds the claim",
+                        group_id,
+                        reservation_id,
+                        state.holder,
+                    )
+                    break
+                self._changed.wait(min(self.POLL_SECONDS, remaining))
+        return partial(self._release, group_id, reservation_id)
+
+    def leave(self, group_id: int, reservation_id: int, confirmed: bool) -> None:
+        """Drop a finished member, releasing the claim if its backend never did."""
+        self._release(group_id, reservation_id, confirmed)
+        with self._changed:
+            state = self._groups[group_id]
+            state.members.discard(reservation_id)
+            if not state.members:
+                del self._groups[group_id]
+
+    def _release(self, group_id: int, reservation_id: int, confirmed: bool) -> None:
+        with self._changed:
+            state = self._groups.get(group_id)
+            if state is None:
+                return
+            state.confirmed = state.confirmed or confirmed
+            if state.holder == reservation_id:
+                state.holder = None
+            self._changed.notify_all()
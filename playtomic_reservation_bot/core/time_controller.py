@@ -1,35 +1,66 @@
 from __future__ import annotations
 
+import threading
 import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 
 class TimeController:
-    """Wait helper with adaptive precision until target datetime."""
+    """Wait helper with adaptive precision until target datetime.
 
-    def __init__(self, local_tz: str) -> None:
+    In precise mode the final second is measured against ``time.perf_counter_ns()``:
+    the remaining wall-clock delta is anchored once to the monotonic clock, slept
+    off coarsely, and the last ``spin_seconds`` are busy-waited.
+
+    Waits block on the caller's cancel event, so cancellation wakes them at once.
+    """
+
+    ANCHOR_SECONDS = 1.0
+    # Re-read the wall clock at least this often so suspend/resume cannot make us late.
+    MAX_WAIT_SECONDS = 300
+
+    def __init__(self, local_tz: str, precise: bool = True, spin_seconds: float = 0.005) -> None:
         self.zone = ZoneInfo(local_tz)
+        self.precise = precise
+        self.spin_ns = int(spin_seconds * 1_000_000_000)
 
     def now(self) -> datetime:
         return datetime.now(self.zone)
 
-    def wait_until(self, target: datetime, cancel_check: callable) -> bool:
+    def wait_until(self, target: datetime, cancel_event: threading.Event) -> bool:
         if target.tzinfo is None:
             target = target.replace(tzinfo=self.zone)
         else:
             target = target.astimezone(self.zone)
 
         while True:
-            if cancel_check():
+            if cancel_event.is_set():
                 return False
 
             delta = (target - self.now()).total_seconds()
             if delta <= 0:
                 return True
-            if delta > 60:
-                time.sleep(30)
-            elif delta > 10:
-                time.sleep(1)
+            if delta > 10:
+                timeout = min(delta - 10, self.MAX_WAIT_SECONDS)
+            elif not self.precise:
+                timeout = min(delta, 0.1)
+            elif delta > self.ANCHOR_SECONDS:
+                timeout = delta - self.ANCHOR_SECONDS
             else:
-                time.sleep(0.1)
+                return self._wait_monotonic(time.perf_counter_ns() + int(delta * 1_000_000_000), cancel_event)
+            if cancel_event.wait(timeout):
+                return False
+
+    def _wait_monotonic(self, deadline_ns: int, cancel_event: threading.Event) -> bool:
+        while True:
+            remaining_ns = deadline_ns - time.perf_counter_ns()
+            if remaining_ns <= self.spin_ns:
+                break
+            if cancel_event.wait((remaining_ns - self.spin_ns) / 1_000_000_000):
+                return False
+        if cancel_event.is_set():
+            return False
+        while time.perf_counter_ns() < deadline_ns:
+            pass
+        return True
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from core.logging_setup import log_context
+
+
+@dataclass(slots=True)
+class PhaseSpan:
+    phase: str
+    duration_ms: float
+    attempt: int = 1
+
+
+class PhaseTimer:
+    """Collects monotonic timing spans for the phases of a booking."""
+
+    def __init__(self) -> None:
+        self.spans: list[PhaseSpan] = []
+
+    @contextmanager
+    def span(self, phase: str, attempt: int = 1) -> Iterator[None]:
+        started = time.perf_counter_ns()
+        try:
+            with log_context(phase=phase):
+                yield
+        finally:
+            self.record(phase, (time.perf_counter_ns() - started) / 1_000_000, attempt)
+
+    def record(self, phase: str, duration_ms: float, attempt: int = 1) -> None:
+        self.spans.append(PhaseSpan(phase, duration_ms, attempt))
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
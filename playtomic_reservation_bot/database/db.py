@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from threading import RLock
 from typing import Any, Iterable
 
+from database.migrate import migrate
+
 
 class Database:
     """SQLite access layer with thread-safe helpers."""
@@ -14,74 +17,126 @@ class Database:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = RLock()
+        self._writer: sqlite3.Connection | None = None
+        self._local = threading.local()
+        self._readers: dict[threading.Thread, sqlite3.Connection] = {}
+        self._readers_lock = threading.Lock()
+        self._closed = False
         self._initialize()
 
+    def _open(self, read_only: bool = False) -> sqlite3.Connection:
+        if read_only:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    def _reader_connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Database is closed")
+            conn = self._open(read_only=True)
+            self._local.conn = conn
+            with self._readers_lock:
+                self._reap_dead_threads()
+                self._readers[threading.current_thread()] = conn
+        return conn
+
+    def _reap_dead_threads(self) -> None:
+        for thread in [t for t in self._readers if not t.is_alive()]:
+            self._readers.pop(thread).close()
+
     @contextmanager
     def _connection(self) -> Iterable[sqlite3.Connection]:
+        """Serialized writer connection; one transaction per block."""
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            if self._writer is None:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Database is closed")
+                self._writer = self._open()
+            conn = self._writer
             try:
                 yield conn
                 conn.commit()
-            finally:
-                conn.close()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    @contextmanager
+    def _read_connection(self) -> Iterable[sqlite3.Connection]:
+        """Per-thread read-only connection; WAL lets it run alongside the writer."""
+        conn = self._reader_connection()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+
+    def close(self) -> None:
+        """Close the writer and every per-thread reader; called once on shutdown."""
+        with self._lock, self._readers_lock:
+            self._closed = True
+            connections = list(self._readers.values())
+            if self._writer is not None:
+                connections.append(self._writer)
+            for conn in connections:
+                try:
+                    conn.close()
+                except sqlite3.ProgrammingError:
+                    pass
+            self._readers.clear()
+            self._writer = None
+        self._local = threading.local()
 
     def _initialize(self) -> None:
         with self._connection() as conn:
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS clubs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    base_url TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS courts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    club_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    booking_fragment_url TEXT NOT NULL,
-                    UNIQUE (club_id, name),
-                    FOREIGN KEY (club_id) REFERENCES clubs(id)
-                );
-
-                CREATE TABLE IF NOT EXISTS accounts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email TEXT NOT NULL UNIQUE,
-                    password TEXT NOT NULL,
-                    active INTEGER NOT NULL DEFAULT 1
-                );
-
-                CREATE TABLE IF NOT EXISTS app_settings (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL
-                );
-
-                CREATE TABLE IF NOT EXISTS reservations (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    court_id INTEGER NOT NULL,
-                    account_id INTEGER NOT NULL,
-                    play_datetime_local TEXT NOT NULL,
-                    execution_datetime_local TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (court_id) REFERENCES courts(id),
-                    FOREIGN KEY (account_id) REFERENCES accounts(id),
-                    UNIQUE (court_id, account_id, play_datetime_local)
-                );
-                """
-            )
+            migrate(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterable[sqlite3.Connection]:
+        """Run several statements atomically on the writer connection."""
+        with self._connection() as conn:
+            yield conn
+
+    def data_version(self) -> int:
+        """Counter that moves whenever another connection or process commits to the file."""
+        with self._connection() as conn:
+            return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def enable_incremental_vacuum(self) -> bool:
+        """Switch to ``auto_vacuum=INCREMENTAL``; True when that needed a (one-off, full) VACUUM."""
+        with self._connection() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            return True
+
+    def incremental_vacuum(self, pages: int = 0) -> None:
+        """Return up to ``pages`` free pages (all when 0) to the filesystem."""
+        with self._connection() as conn:
+            # execute() steps a PRAGMA once, freeing a single page; executescript() runs it to completion.
+            conn.executescript(f"PRAGMA incremental_vacuum({pages:d});")
 
     def execute(self, query: str, params: tuple[Any, ...] = ()) -> int:
         with self._connection() as conn:
             cursor = conn.execute(query, params)
             return cursor.lastrowid
 
-    def fetchone(self, query: str, params: tuple[Any, ...] = ()) -> sqlite3.Row | None:
+    def executemany(self, query: str, rows: Iterable[tuple[Any, ...]]) -> None:
         with self._connection() as conn:
+            conn.executemany(query, rows)
+
+    def fetchone(self, query: str, params: tuple[Any, ...] = ()) -> sqlite3.Row | None:
+        with self._read_connection() as conn:
             return conn.execute(query, params).fetchone()
 
     def fetchall(self, query: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
-        with self._connection() as conn:
+        with self._read_connection() as conn:
             return conn.execute(query, params).fetchall()
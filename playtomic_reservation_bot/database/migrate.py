@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import importlib
+import re
+import sqlite3
+from pathlib import Path
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+_MIGRATION_FILE = re.compile(r"^(\d{4})_\w+\.py$")
+
+
+def available_migrations() -> list[tuple[int, str]]:
+    """``(version, module name)`` for every ``NNNN_name.py`` in ``migrations/``, oldest first."""
+    found = []
+    for path in MIGRATIONS_DIR.glob("*.py"):
+        match = _MIGRATION_FILE.match(path.name)
+        if match:
+            found.append((int(match.group(1)), f"database.migrations.{path.stem}"))
+    return sorted(found)
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def ensure_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> None:
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations, each in its own transaction; returns the resulting schema version.
+
+    A current schema costs one ``PRAGMA user_version`` read. The version is checked
+    again under ``BEGIN IMMEDIATE`` so two processes starting together do not both
+    apply the same step.
+    """
+    current = schema_version(conn)
+    pending = [(version, name) for version, name in available_migrations() if version > current]
+    for version, name in pending:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            importlib.import_module(name).upgrade(conn)
+            conn.execute(f"PRAGMA user_version = {version:d}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return schema_version(conn) if pending else current
@@ -0,0 +1,85 @@
+"""Tables as they existed before versioned migrations; idempotent on older databases."""
+from __future__ import annotations
+
+import sqlite3
+
+from database.migrate import ensure_column
+
+STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS clubs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        base_url TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS courts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        club_id INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        booking_fragment_url TEXT NOT NULL,
+        UNIQUE (club_id, name),
+        FOREIGN KEY (club_id) REFERENCES clubs(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS accounts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        email TEXT NOT NULL UNIQUE,
+        password TEXT NOT NULL,
+        active INTEGER NOT NULL DEFAULT 1
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS app_settings (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS reservations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        court_id INTEGER NOT NULL,
+        account_id INTEGER NOT NULL,
+        play_datetime_local TEXT NOT NULL,
+        execution_datetime_local TEXT NOT NULL,
+        status TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (court_id) REFERENCES courts(id),
+        FOREIGN KEY (account_id) REFERENCES accounts(id),
+        UNIQUE (court_id, account_id, play_datetime_local)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS reservation_timings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        reservation_id INTEGER NOT NULL,
+        attempt INTEGER NOT NULL DEFAULT 1,
+        phase TEXT NOT NULL,
+        duration_ms REAL NOT NULL,
+        recorded_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (reservation_id) REFERENCES reservations(id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_reservation_timings_reservation
+        ON reservation_timings (reservation_id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS reservation_groups (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        status TEXT NOT NULL,
+        winner_reservation_id INTEGER,
+        created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    for statement in STATEMENTS:
+        conn.execute(statement)
+    ensure_column(conn, "reservations", "group_id", "INTEGER REFERENCES reservation_groups(id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_reservations_group ON reservations (group_id)")
+    ensure_column(conn, "reservations", "priority", "INTEGER NOT NULL DEFAULT 0")
@@ -0,0 +1,17 @@
+"""Indexes for the scheduler's pending scan, the list ordering and the court joins."""
+from __future__ import annotations
+
+import sqlite3
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reservations_status_execution "
+        "ON reservations (status, execution_datetime_local)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_courts_club ON courts (club_id)")
+    # Live jobs are a handful of rows among the whole history; this index only holds those.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reservations_active ON reservations (execution_datetime_local) "
+        "WHERE status IN ('Pending', 'Waiting', 'Running')"
+    )
@@ -0,0 +1,48 @@
+"""UTC epoch-millisecond copies of the reservation instants, so ordering and ranges use integer indexes.
+
+The ISO strings carry their UTC offset and sort wrongly across DST changes; they stay
+as the human-readable record. Rows without an offset are read in the configured
+``local_tz``.
+"""
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from database.migrate import ensure_column
+
+
+def _epoch_ms(value: str, zone: ZoneInfo) -> int:
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=zone)
+    return round(moment.timestamp() * 1000)
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    ensure_column(conn, "reservations", "play_epoch_ms", "INTEGER")
+    ensure_column(conn, "reservations", "execution_epoch_ms", "INTEGER")
+
+    setting = conn.execute("SELECT value FROM app_settings WHERE key = 'local_tz'").fetchone()
+    zone = ZoneInfo(setting[0] if setting else "Europe/Madrid")
+    rows = conn.execute(
+        "SELECT id, play_datetime_local, execution_datetime_local FROM reservations WHERE execution_epoch_ms IS NULL"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE reservations SET play_epoch_ms = ?, execution_epoch_ms = ? WHERE id = ?",
+        [(_epoch_ms(row[1], zone), _epoch_ms(row[2], zone), row[0]) for row in rows],
+    )
+
+    # The text-keyed indexes from 0002 are superseded by their epoch equivalents.
+    conn.execute("DROP INDEX IF EXISTS idx_reservations_status_execution")
+    conn.execute("DROP INDEX IF EXISTS idx_reservations_active")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reservations_status_execution_epoch "
+        "ON reservations (status, execution_epoch_ms)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_reservations_execution_epoch ON reservations (execution_epoch_ms, id)")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reservations_active_epoch ON reservations (execution_epoch_ms) "
+        "WHERE status IN ('Pending', 'Waiting', 'Running')"
+    )
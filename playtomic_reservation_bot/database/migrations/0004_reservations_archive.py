@@ -0,0 +1,45 @@
+"""Archive tables for finished reservations and their timings, kept out of the hot tables."""
+from __future__ import annotations
+
+import sqlite3
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reservations_archive (
+            id INTEGER PRIMARY KEY,
+            court_id INTEGER NOT NULL,
+            account_id INTEGER NOT NULL,
+            play_datetime_local TEXT NOT NULL,
+            execution_datetime_local TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            group_id INTEGER,
+            priority INTEGER NOT NULL DEFAULT 0,
+            play_epoch_ms INTEGER,
+            execution_epoch_ms INTEGER,
+            archived_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reservations_archive_execution_epoch "
+        "ON reservations_archive (execution_epoch_ms, id)"
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reservation_timings_archive (
+            id INTEGER PRIMARY KEY,
+            reservation_id INTEGER NOT NULL,
+            attempt INTEGER NOT NULL,
+            phase TEXT NOT NULL,
+            duration_ms REAL NOT NULL,
+            recorded_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reservation_timings_archive_reservation "
+        "ON reservation_timings_archive (reservation_id)"
+    )
@@ -0,0 +1,13 @@
+"""Drop the partial active-jobs index: no query can use it, yet every write maintains it.
+
+The scheduler filters on ``status = 'Pending'`` and the list queries bind their
+statuses as parameters, so neither implies the index's ``WHERE`` clause;
+``idx_reservations_status_execution_epoch`` serves both.
+"""
+from __future__ import annotations
+
+import sqlite3
+
+
+def upgrade(conn: sqlite3.Connection) -> None:
+    conn.execute("DROP INDEX IF EXISTS idx_reservations_active_epoch")
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from tkinter import TclError
+from typing import Any
+
+_SUPERSEDED = object()
+
+
+class BackgroundFetcher:
+    """Runs UI queries on a worker thread and hands the results back to Tk with ``after()``.
+
+    Each request has a key; a newer request for the same key supersedes the older
+    ones, which are skipped if they have not started and dropped if they have.
+    """
+
+    def __init__(self, widget: Any, logger: logging.Logger) -> None:
+        self.widget = widget
+        self.logger = logger
+        # One thread keeps queries ordered and reuses a single read-only connection.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ui-fetch")
+        self._generations: dict[str, int] = {}
+        self._applied: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, key: str, query: Callable[[], Any], on_result: Callable[[Any], None]) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            generation = self._generations[key] = self._generations.get(key, 0) + 1
+
+        def run() -> Any:
+            if not self._is_current(key, generation):
+                return _SUPERSEDED
+            return query()
+
+        future = self._executor.submit(run)
+        future.add_done_callback(lambda done: self._deliver(key, generation, done, on_result))
+
+    def is_pending(self, key: str) -> bool:
+        """True while the latest request for ``key`` has not been applied yet."""
+        with self._lock:
+            return key in self._generations and self._applied.get(key) != self._generations[key]
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_current(self, key: str, generation: int) -> bool:
+        with self._lock:
+            return not self._closed and self._generations.get(key) == generation
+
+    def _deliver(self, key: str, generation: int, future: Future, on_result: Callable[[Any], None]) -> None:
+        if future.cancelled() or not self._is_current(key, generation):
+            return
+        try:
+            self.widget.after(0, self._apply, key, generation, future, on_result)
+        except (RuntimeError, TclError):
+            pass  # window already destroyed or main loop gone
+
+    def _apply(self, key: str, generation: int, future: Future, on_result: Callable[[Any], None]) -> None:
+        if not self._is_current(key, generation):
+            return
+        with self._lock:
+            self._applied[key] = generation
+        error = future.exception()
+        if error is not None:
+            self.logger.error("UI fetch %r failed", key, exc_info=error)
+            return
+        result = future.result()
+        if result is not _SUPERSEDED:
+            on_result(result)
@@ -1,27 +1,39 @@
 from __future__ import annotations
 
+import threading
+import time
 from datetime import datetime
 from tkinter import messagebox, ttk
 
 import customtkinter as ctk
 
-from core.reservation_service import ReservationService
+from core.reservation_service import ReservationChange, ReservationQuery, ReservationService
 from core.scheduler import ReservationScheduler
 from database.db import Database
-from ui.reservation_window import ReservationDialog
-from ui.settings_window import SettingsWindow
+from ui.background_fetcher import BackgroundFetcher
 
 
 class MainWindow(ctk.CTk):
+    CHANGE_DEBOUNCE_MS = 100
+    DATA_VERSION_POLL_MS = 2000
+    MAX_ROWS = 2000
+
     def __init__(self, db: Database, service: ReservationService, scheduler: ReservationScheduler) -> None:
         super().__init__()
         self.db = db
         self.service = service
         self.scheduler = scheduler
+        self.fetcher = BackgroundFetcher(self, logger=service.logger)
         self.title("Playtomic Reservation Bot")
         self.geometry("1100x620")
 
-        self.scheduler.set_status_callback(self._threadsafe_refresh)
+        # Status deltas from booking threads, applied together on the Tk thread.
+        self._pending_changes: dict[int, str] = {}
+        self._changes_lock = threading.Lock()
+        self._flush_scheduled = False
+        self._data_version: int | None = None
+        self._history_days = int(self._get_setting("ui_history_days", "7"))
+        self.service.add_change_listener(self._on_reservation_change)
 
         self.club_selector = ctk.CTkOptionMenu(self, values=[""], command=lambda _: self.refresh_courts())
         self.court_selector = ctk.CTkOptionMenu(self, values=[""])
@@ -36,12 +48,14 @@ class MainWindow(ctk.CTk):
         ctk.CTkButton(self, text="Iniciar Automatización", command=self.scheduler.start).grid(row=1, column=4, padx=8)
         ctk.CTkButton(self, text="Cancelar Reserva", command=self.cancel_selected).grid(row=1, column=5, padx=8)
 
-        cols = ("id", "court", "email", "play_dt", "execution_dt", "status", "created")
+        cols = ("id", "court", "email", "play_dt", "execution_dt", "status", "created", "group")
         self.tree = ttk.Treeview(self, columns=cols, show="headings", height=20)
         for col in cols:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=150)
         self.tree.grid(row=2, column=0, columnspan=6, padx=10, pady=10, sticky="nsew")
+        # Treeview item id (the reservation id) -> values currently shown.
+        self._tree_rows: dict[str, tuple] = {}
 
         self.grid_rowconfigure(2, weight=1)
         for c in range(6):
@@ -49,20 +63,55 @@ class MainWindow(ctk.CTk):
 
         self.refresh_selectors()
         self.refresh_reservations()
-        self.after(1000, self._periodic_refresh)
-
-    def _threadsafe_refresh(self) -> None:
-        self.after(0, self.refresh_reservations)
-
-    def _periodic_refresh(self) -> None:
-        self.refresh_reservations()
-        self.after(1500, self._periodic_refresh)
+        self.after(self.DATA_VERSION_POLL_MS, self._poll_data_version)
+
+    def _on_reservation_change(self, change: ReservationChange) -> None:
+        """Called from any thread; coalesces bursts into one flush per debounce window."""
+        with self._changes_lock:
+            self._pending_changes[change.reservation_id] = change.status
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self.after(self.CHANGE_DEBOUNCE_MS, self._flush_changes)
+
+    def _flush_changes(self) -> None:
+        with self._changes_lock:
+            changes, self._pending_changes = self._pending_changes, {}
+            self._flush_scheduled = False
+        # A list fetch still in flight may predate these writes, so it is superseded by a fresh one.
+        if self.fetcher.is_pending("reservations") or any(str(i) not in self._tree_rows for i in changes):
+            self.refresh_reservations()
+            return
+        for reservation_id, status in changes.items():
+            iid = str(reservation_id)
+            values = (*self._tree_rows[iid][:5], status, *self._tree_rows[iid][6:])
+            if values != self._tree_rows[iid]:
+                self.tree.item(iid, values=values)
+                self._tree_rows[iid] = values
+
+    def _poll_data_version(self) -> None:
+        # Fallback for writers in other processes (the headless CLI), which publish no changes here.
+        self.fetcher.submit("data_version", self.db.data_version, self._on_data_version)
+        self.after(self.DATA_VERSION_POLL_MS, self._poll_data_version)
+
+    def _on_data_version(self, version: int) -> None:
+        if self._data_version is not None and version != self._data_version:
+            # Another process may have added or cancelled jobs: resync the scheduler heap too, off the Tk thread.
+            self.fetcher.submit("scheduler_reload", self.scheduler.reload, lambda _: None)
+            self.refresh_reservations()
+        self._data_version = version
 
     def get_accounts(self) -> list[dict]:
         return [dict(r) for r in self.db.fetchall("SELECT id, email FROM accounts WHERE active = 1 ORDER BY email")]
 
     def refresh_selectors(self) -> None:
-        clubs = [dict(r) for r in self.db.fetchall("SELECT id, name FROM clubs ORDER BY name")]
+        self.fetcher.submit(
+            "clubs",
+            lambda: [dict(r) for r in self.db.fetchall("SELECT id, name FROM clubs ORDER BY name")],
+            self._apply_clubs,
+        )
+
+    def _apply_clubs(self, clubs: list[dict]) -> None:
         values = [f"{c['id']}|{c['name']}" for c in clubs] or [""]
         self.club_selector.configure(values=values)
         self.club_selector.set(values[0])
@@ -71,16 +120,23 @@ class MainWindow(ctk.CTk):
     def refresh_courts(self) -> None:
         club_value = self.club_selector.get()
         if "|" not in club_value:
-            self.court_selector.configure(values=[""])
-            self.court_selector.set("")
+            self.fetcher.submit("courts", list, self._apply_courts)
             return
         club_id = int(club_value.split("|")[0])
-        courts = [dict(r) for r in self.db.fetchall("SELECT id, name FROM courts WHERE club_id = ?", (club_id,))]
+        self.fetcher.submit(
+            "courts",
+            lambda: [dict(r) for r in self.db.fetchall("SELECT id, name FROM courts WHERE club_id = ?", (club_id,))],
+            self._apply_courts,
+        )
+
+    def _apply_courts(self, courts: list[dict]) -> None:
         values = [f"{c['id']}|{c['name']}" for c in courts] or [""]
         self.court_selector.configure(values=values)
         self.court_selector.set(values[0])
 
     def open_settings(self) -> None:
+        from ui.settings_window import SettingsWindow
+
         SettingsWindow(self, db=self.db, on_change=self._on_settings_change)
 
     def _on_settings_change(self) -> None:
@@ -88,6 +144,8 @@ class MainWindow(ctk.CTk):
         local_tz = self._get_setting("local_tz", "Europe/Madrid")
         target_tz = self._get_setting("target_tz", "UTC")
         self.service.refresh_timezones(local_tz, target_tz)
+        self._history_days = int(self._get_setting("ui_history_days", "7"))
+        self.refresh_reservations()
 
     def _get_setting(self, key: str, default: str) -> str:
         row = self.db.fetchone("SELECT value FROM app_settings WHERE key = ?", (key,))
@@ -98,48 +156,95 @@ class MainWindow(ctk.CTk):
         if not accounts:
             messagebox.showerror("Error", "No hay cuentas activas")
             return
+        from ui.reservation_window import ReservationDialog  # pulls in tkcalendar
+
         ReservationDialog(self, accounts=accounts, on_submit=self._create_reservation)
 
-    def _create_reservation(self, play_dt: datetime, account_id: int) -> None:
+    def _create_reservation(self, play_dt: datetime, account_id: int, hedge: bool = False) -> None:
         court_value = self.court_selector.get()
         if "|" not in court_value:
             messagebox.showerror("Error", "Seleccione una cancha")
             return
         court_id = int(court_value.split("|")[0])
         try:
-            self.service.create_reservation(court_id, account_id, play_dt)
-            self.refresh_reservations()
+            if hedge:
+                club_id = int(self.club_selector.get().split("|")[0])
+                court_ids = [court_id] + [
+                    r["id"] for r in self.db.fetchall("SELECT id FROM courts WHERE club_id = ?", (club_id,))
+                ]
+                self.service.create_slot_group(court_ids, [account_id], play_dt)
+            else:
+                self.service.create_reservation(court_id, account_id, play_dt)
             messagebox.showinfo("OK", "Reserva agregada")
         except Exception as exc:  # noqa: BLE001
             messagebox.showerror("Error", str(exc))
 
     def refresh_reservations(self) -> None:
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        for row in self.service.list_reservations():
-            self.tree.insert(
-                "",
-                "end",
-                values=(
-                    row["id"],
-                    row["court_name"],
-                    row["email"],
-                    row["play_datetime_local"],
-                    row["execution_datetime_local"],
-                    row["status"],
-                    row["created_at"],
-                ),
+        self.fetcher.submit("reservations", self._visible_reservations, self._apply_reservations)
+
+    def _visible_reservations(self) -> list[dict]:
+        """Runs on the fetch worker: every active job, plus the newest finished ones from ``ui_history_days`` ago."""
+        since = time.time_ns() // 1_000_000 - self._history_days * 86_400_000
+        active = self.service.iter_reservations(ReservationQuery(statuses=self.service.ACTIVE_STATUSES))
+        # Read from the newest end so MAX_ROWS only ever drops the oldest history.
+        finished = self.service.query_reservations(
+            ReservationQuery(
+                statuses=self.service.FINISHED_STATUSES, from_epoch_ms=since, limit=self.MAX_ROWS, descending=True
             )
+        ).rows
+        return sorted([*active, *finished], key=lambda row: (row["execution_epoch_ms"], row["id"]))
+
+    @staticmethod
+    def _row_values(row: dict) -> tuple:
+        return (
+            row["id"],
+            row["court_name"],
+            row["email"],
+            row["play_datetime_local"],
+            row["execution_datetime_local"],
+            row["status"],
+            row["created_at"],
+            row["group_id"] or "",
+        )
+
+    def _apply_reservations(self, rows: list[dict]) -> None:
+        """Diff ``rows`` against the tree; unchanged items are left alone so selection and scroll survive."""
+        wanted = {str(row["id"]): self._row_values(row) for row in rows}
+        first_visible = self.tree.yview()[0]
+        structural = False
+
+        for iid in [iid for iid in self._tree_rows if iid not in wanted]:
+            self.tree.delete(iid)
+            del self._tree_rows[iid]
+            structural = True
+        for index, (iid, values) in enumerate(wanted.items()):
+            shown = self._tree_rows.get(iid)
+            if shown is None:
+                self.tree.insert("", index, iid=iid, values=values)
+                structural = True
+            elif shown != values:
+                self.tree.item(iid, values=values)
+            self._tree_rows[iid] = values
+
+        order = list(wanted)
+        if list(self.tree.get_children()) != order:
+            for index, iid in enumerate(order):
+                self.tree.move(iid, "", index)
+            structural = True
+        if structural:
+            self.tree.yview_moveto(first_visible)
 
     def cancel_selected(self) -> None:
         selected = self.tree.selection()
         if not selected:
             messagebox.showwarning("Aviso", "Seleccione una reserva")
             return
-        reservation_id = int(self.tree.item(selected[0])["values"][0])
+        reservation_id = int(selected[0])
         self.scheduler.cancel_reservation(reservation_id)
-        self.refresh_reservations()
 
     def on_close(self) -> None:
+        # Jobs interrupted below keep publishing changes after the main loop is gone.
+        self.service.remove_change_listener(self._on_reservation_change)
+        self.fetcher.close()
         self.scheduler.stop()
         self.destroy()
@@ -11,7 +11,7 @@ class ReservationDialog(ctk.CTkToplevel):
     def __init__(self, parent: ctk.CTk, accounts: list[dict], on_submit: callable) -> None:
         super().__init__(parent)
         self.title("Nueva Reserva")
-        self.geometry("420x280")
+        self.geometry("420x330")
         self.accounts = accounts
         self.on_submit = on_submit
 
@@ -27,6 +27,9 @@ class ReservationDialog(ctk.CTkToplevel):
         self.acc_menu = ctk.CTkOptionMenu(self, values=[f"{a['id']}|{a['email']}" for a in accounts])
         self.acc_menu.pack(pady=6)
 
+        self.hedge_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(self, text="Cubrir todas las canchas del club", variable=self.hedge_var).pack(pady=6)
+
         ctk.CTkButton(self, text="Guardar", command=self.submit).pack(pady=10)
 
     def submit(self) -> None:
@@ -35,7 +38,7 @@ class ReservationDialog(ctk.CTkToplevel):
             hour_value = self.hour_entry.get().strip()
             dt = datetime.fromisoformat(f"{date_value}T{hour_value}:00")
             account_id = int(self.acc_menu.get().split("|")[0])
-            self.on_submit(dt, account_id)
+            self.on_submit(dt, account_id, self.hedge_var.get())
             self.destroy()
         except Exception as exc:  # noqa: BLE001
             messagebox.showerror("Error", f"Datos inválidos: {exc}")